@@ -168,7 +168,9 @@ class ImageItem:
         # Restore feature vector if present
         feature_list = data.get("feature_vector")
         if feature_list is not None:
-            item.feature_vector = np.array(feature_list)
+            # float32, as extracted: a plain np.array() of Python floats would
+            # be float64, twice the memory and upcast in every comparison
+            item.feature_vector = np.array(feature_list, dtype=np.float32)
 
         return item
 
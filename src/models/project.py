@@ -22,13 +22,14 @@ class Project:
             return
 
         try:
-            for filename in sorted(os.listdir(self.input_folder)):
-                file_path = os.path.join(self.input_folder, filename)
-
-                if os.path.isfile(file_path):
-                    _, ext = os.path.splitext(filename)
-                    if ext.lower() in [fmt.lower() for fmt in supported_formats]:
-                        image_item = ImageItem(file_path)
+            # scandir's entries usually know their type from the directory
+            # listing itself, so is_file() costs no extra stat per file.
+            formats = frozenset(fmt.lower() for fmt in supported_formats)
+            with os.scandir(self.input_folder) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    _, ext = os.path.splitext(entry.name)
+                    if ext.lower() in formats and entry.is_file():
+                        image_item = ImageItem(entry.path)
                         self.images.append(image_item)
 
             print(f"Loaded {len(self.images)} images from {self.input_folder}")
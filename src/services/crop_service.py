@@ -257,7 +257,8 @@ class CropService:
                         final_img,
                         display_date,
                         size_tag,
-                        output_path
+                        output_path,
+                        in_place=True  # final_img is this call's own copy
                     )
 
             # Ensure output directory exists
@@ -1,11 +1,46 @@
 import os
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
-from PIL import Image
+from typing import Optional, Union
+from PIL import Image, JpegImagePlugin
 import piexif
 from ..utils.image_loader import open_oriented
 
+# EXIF tags: the Exif sub-IFD pointer, DateTimeOriginal (in that sub-IFD)
+# and DateTime (in the main IFD).
+_EXIF_IFD_POINTER = 0x8769
+_TAG_DATETIME_ORIGINAL = 36867
+_TAG_DATETIME = 306
+
+_EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+# Threads for reading capture dates ahead of a rename. The work is file I/O
+# plus Pillow's header parsing, so it overlaps well beyond the core count.
+EXIF_READ_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+
+
+def _parse_exif_datetime(value: Union[str, bytes]) -> datetime:
+    """
+    Parse an EXIF "YYYY:MM:DD HH:MM:SS" timestamp.
+
+    The layout is fixed, so slicing it by hand is several times faster than
+    strptime, which re-interprets its format string on every call. Anything
+    off that layout goes through strptime, so it fails exactly as before.
+    Takes piexif's raw bytes as well as Pillow's str, and ignores the NUL
+    terminator some cameras leave on the value.
+    """
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    value = value.rstrip('\x00')
+    if (len(value) == 19 and value[4] == value[7] == ":" and value[10] == " "
+            and value[13] == value[16] == ":"):
+        try:
+            return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]), int(value[17:19]))
+        except ValueError:
+            pass
+    return datetime.strptime(value, _EXIF_DATE_FORMAT)
+
 
 class ImageProcessor:
     """Service for processing images: EXIF reading, renaming, thumbnails."""
@@ -14,37 +49,45 @@ class ImageProcessor:
     def read_exif_date(file_path: str) -> Optional[datetime]:
         """Extract date taken from EXIF data."""
         try:
-            # Wrapper for HEIC support
-            import pillow_heif
-            pillow_heif.register_heif_opener()
+            # HEIC support is registered once, when image_loader is imported.
 
             # For HEIC and potentially others, standard piexif.load(path) might fail
             # or simply not work. We'll try a robust approach using Pillow for metadata.
 
-            # First try Pillow directly as it's cleaner for HEIC
+            # First try Pillow directly as it's cleaner for HEIC. Opening
+            # only parses the header segments, never the pixel data.
+            pillow_found_no_date = False
             try:
                 with Image.open(file_path) as img:
                     exif = img.getexif()
+                    date_str = None
                     if exif:
-                        # 36867 is DateTimeOriginal, 306 is DateTime
-                        date_str = exif.get(36867) or exif.get(306)
-                        if date_str:
-                            return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                        # DateTimeOriginal lives in the Exif sub-IFD, which
+                        # getexif() does not flatten into the main one; looking
+                        # for it there always missed and re-read the file with
+                        # piexif below.
+                        date_str = (exif.get_ifd(_EXIF_IFD_POINTER).get(_TAG_DATETIME_ORIGINAL)
+                                    or exif.get(_TAG_DATETIME_ORIGINAL)
+                                    or exif.get(_TAG_DATETIME))
+                    if date_str:
+                        return _parse_exif_datetime(date_str)
+                    pillow_found_no_date = True
             except Exception:
-                pass  # Fallback to strict piexif if Pillow fails or returns nothing
+                pass  # Fallback to strict piexif if Pillow fails
 
-            # Legacy/Fallback method (Piexif)
-            exif_dict = piexif.load(file_path)
+            # Pillow reads the same IFDs piexif does, so when it opened the
+            # file and found no date, reading the file again cannot find one.
+            if not pillow_found_no_date:
+                # Legacy/Fallback method (Piexif)
+                exif_dict = piexif.load(file_path)
 
-            # Try to get DateTimeOriginal first (when photo was taken)
-            if piexif.ExifIFD.DateTimeOriginal in exif_dict.get("Exif", {}):
-                date_str = exif_dict["Exif"][piexif.ExifIFD.DateTimeOriginal].decode('utf-8')
-                return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                # Try to get DateTimeOriginal first (when photo was taken)
+                if piexif.ExifIFD.DateTimeOriginal in exif_dict.get("Exif", {}):
+                    return _parse_exif_datetime(exif_dict["Exif"][piexif.ExifIFD.DateTimeOriginal])
 
-            # Fallback to DateTime
-            if piexif.ImageIFD.DateTime in exif_dict.get("0th", {}):
-                date_str = exif_dict["0th"][piexif.ImageIFD.DateTime].decode('utf-8')
-                return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                # Fallback to DateTime
+                if piexif.ImageIFD.DateTime in exif_dict.get("0th", {}):
+                    return _parse_exif_datetime(exif_dict["0th"][piexif.ImageIFD.DateTime])
 
         except Exception as e:
             print(f"Could not read EXIF from {file_path}: {e}")
@@ -74,6 +117,10 @@ class ImageProcessor:
                 info["Format"] = img.format or "Unknown"
 
                 exif = img.getexif()
+                # The raw EXIF block Pillow already read from the header, for
+                # piexif below. Formats that don't keep it in info (TIFF) get
+                # it re-serialized from what getexif() parsed.
+                exif_bytes = img.info.get("exif") or (exif.tobytes() if exif else None)
                 if exif:
                     # Common EXIF tags
                     # 271: Make, 272: Model
@@ -90,9 +137,12 @@ class ImageProcessor:
                     # Pillow doesn't always automatically parse sub-IFDs with getexif()
                     # So we might need to rely on piexif for deep dive or use get_ifd if available in newer Pillow
 
-            # Use piexif for more detailed EXIF data if available
+            # Use piexif for more detailed EXIF data if available, parsing the
+            # bytes Pillow already has rather than reading the file again
             try:
-                exif_dict = piexif.load(file_path)
+                if not exif_bytes:
+                    return info
+                exif_dict = piexif.load(exif_bytes)
 
                 if "0th" in exif_dict:
                     if piexif.ImageIFD.Make in exif_dict["0th"]:
@@ -144,11 +194,18 @@ class ImageProcessor:
         renamed_count = 0
         name_counter = {}  # To handle duplicate timestamps
 
-        for image_item in project.images:
-            # Read EXIF date if not already read
-            if image_item.date_taken is None:
-                image_item.date_taken = ImageProcessor.read_exif_date(image_item.file_path)
+        # Read any missing EXIF dates up front and in parallel; each one
+        # blocks on the disk. The rename loop below stays sequential, since
+        # duplicate numbering depends on the order.
+        unread = [item for item in project.images if item.date_taken is None]
+        if unread:
+            with ThreadPoolExecutor(max_workers=min(EXIF_READ_WORKERS, len(unread))) as executor:
+                dates = executor.map(ImageProcessor.read_exif_date,
+                                     [item.file_path for item in unread])
+                for image_item, date_taken in zip(unread, dates):
+                    image_item.date_taken = date_taken
 
+        for image_item in project.images:
             if image_item.date_taken is None:
                 print(f"Skipping {image_item.file_path}: no date available")
                 continue
@@ -175,9 +232,10 @@ class ImageProcessor:
             if image_item.file_path == new_file_path:
                 continue
 
-            # Rename the file
+            # Rename the file. Same directory, so always a plain rename; this
+            # skips shutil.move's directory checks and copy fallback.
             try:
-                shutil.move(image_item.file_path, new_file_path)
+                os.replace(image_item.file_path, new_file_path)
                 image_item.file_path = new_file_path
                 renamed_count += 1
                 print(f"Renamed to: {new_filename}")
@@ -190,13 +248,40 @@ class ImageProcessor:
     def generate_thumbnail(file_path: str, size: int = 200) -> Optional[Image.Image]:
         """Generate a thumbnail for an image file, EXIF orientation applied."""
         try:
-            img = open_oriented(file_path)
-            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            # Draft at twice the thumbnail size: JPEGs skip most of the full
+            # decode, and the resample still has real pixels to work from.
+            # thumbnail() also pre-reduces by whole factors, so the final
+            # filter covers only a few source pixels per output pixel; there
+            # Pillow's BILINEAR (antialiased when shrinking) looks the same
+            # as LANCZOS at thumbnail size and costs far less.
+            img = open_oriented(file_path, draft_size=(size * 2, size * 2))
+            img.thumbnail((size, size), Image.Resampling.BILINEAR)
             return img
         except Exception as e:
             print(f"Error generating thumbnail for {file_path}: {e}")
             return None
 
+    @staticmethod
+    def _jpeg_encoding(file_path: str) -> dict:
+        """
+        Save options that re-encode a JPEG with its own compression settings.
+
+        Re-using the source's quantization tables and chroma subsampling keeps
+        a rotated photo's quality and size where they were, where a fixed
+        quality=95 re-quantizes every block (and usually grows the file). Falls
+        back to quality=95 if the tables can't be read.
+        """
+        try:
+            with Image.open(file_path) as src:
+                if isinstance(src, JpegImagePlugin.JpegImageFile) and src.quantization:
+                    return {
+                        "qtables": src.quantization,
+                        "subsampling": JpegImagePlugin.get_sampling(src),
+                    }
+        except Exception:
+            pass
+        return {"quality": 95}
+
     @staticmethod
     def rotate_image(file_path: str, degrees: int = -90) -> bool:
         """
@@ -209,10 +294,12 @@ class ImageProcessor:
         Returns:
             True if rotation was successful, False otherwise
         """
+        if degrees % 360 == 0:
+            # Nothing to turn; don't re-encode the file for no change
+            return True
+
         try:
-            # Register HEIC support
-            import pillow_heif
-            pillow_heif.register_heif_opener()
+            # HEIC support is registered once, when image_loader is imported.
 
             # Rotate relative to what the user sees, not the raw sensor buffer:
             # open_oriented() applies (and strips) any EXIF orientation, so the
@@ -235,8 +322,9 @@ class ImageProcessor:
 
                 # Save the rotated image back
                 if img_format.upper() in ("JPEG", "JPG"):
-                    rotated_img.save(file_path, format="JPEG", quality=95,
-                                     optimize=True, **save_kwargs)
+                    rotated_img.save(file_path, format="JPEG", optimize=True,
+                                     **ImageProcessor._jpeg_encoding(file_path),
+                                     **save_kwargs)
                 else:
                     rotated_img.save(file_path, format=img_format, **save_kwargs)
 
@@ -1,17 +1,166 @@
 """Service for finding similar images using deep learning feature extraction."""
+import json
 import os
+import threading
 from typing import List, Tuple, Optional, Dict
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
 from ..utils.image_loader import open_oriented
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 # Lazy imports for torch to avoid loading if not needed
 _model = None
 _transform = None
+_device = None
+
+# Images per forward pass when extracting features for a directory
+FEATURE_BATCH_SIZE = 32
+# Threads decoding and preprocessing images for a batch (PIL releases the GIL)
+PREPROCESS_WORKERS = 4
+# New features are appended to a directory's cache every this many images,
+# so a scan that is interrupted keeps what it has extracted so far
+CACHE_CHECKPOINT_IMAGES = 256
+# Smallest size a JPEG is decoded at for feature extraction. Preprocessing
+# resizes the short side to 256, so a little above that keeps the resize
+# working from real pixels while libjpeg skips most of a large photo.
+FEATURE_DRAFT_SIZE = (288, 288)
 
 CACHE_FOLDER_NAME = ".cache"
-CACHE_FILE_NAME = "feature_cache.npz"
+# Feature cache: raw L2-normalized float16 rows, appended to as images are
+# added and memory-mapped when loaded, plus an index of the row length and
+# the image path behind each row
+CACHE_FEATURES_FILE = "features.f16"
+CACHE_INDEX_FILE = "feature_index.json"
+# Earlier cache layouts, still read when the files above are absent
+LEGACY_MATRIX_FILE = "features.npy"
+LEGACY_PATHS_FILE = "feature_paths.json"
+LEGACY_CACHE_FILE_NAME = "feature_cache.npz"
+LEGACY_PATHS_KEY = "paths"
+LEGACY_FEATURES_KEY = "features"
+
+# Matrices with at least this many rows are searched through an approximate
+# nearest-neighbour index when faiss is installed; below it, and without
+# faiss, the exact scan is used.
+ANN_MIN_ROWS = 5000
+
+# One lock per cache folder. A save reads the index, writes rows at the
+# offset it gives, then rewrites the index; the shared service can be saving
+# one folder from two threads (e.g. the printed-photo import and a search),
+# and interleaved saves would index one image's row as another's.
+_cache_locks: Dict[str, threading.Lock] = {}
+_cache_locks_guard = threading.Lock()
+
+
+def _cache_lock(directory: str) -> threading.Lock:
+    """The lock guarding ``directory``'s feature cache files."""
+    key = os.path.normcase(os.path.abspath(directory))
+    with _cache_locks_guard:
+        return _cache_locks.setdefault(key, threading.Lock())
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize the rows of a float matrix in place and return their norms.
+
+    An all-zero row has no direction; it stays zero.
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return norms[:, 0]
+
+
+class FeatureMatrix:
+    """
+    Feature vectors for a set of images, as one contiguous float32 matrix.
+
+    Rows are L2-normalized once, here, so scoring a search against every
+    image is a single matrix-vector product with the normalized target,
+    instead of restacking and renormalizing per-image arrays each time.
+    ``paths[i]`` is the image behind row i.
+    """
+
+    def __init__(self, paths: List[str], vectors: List[np.ndarray]):
+        self.paths = list(paths)
+        self._rows = {path: row for row, path in enumerate(self.paths)}
+        self._ann_index = None
+        if not vectors:
+            self.matrix = np.empty((0, 0), dtype=np.float32)
+            self.nonzero = np.empty(0, dtype=bool)
+            return
+
+        matrix = np.array(vectors, dtype=np.float32)
+        # Extracted features are unit vectors already; this also covers
+        # vectors from caches written before they were.
+        # An all-zero vector stays zero and scores 0.
+        self.nonzero = _normalize_rows(matrix) > 0
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def row_of(self, path: str) -> Optional[int]:
+        """The row holding ``path``'s features, or None if it has none."""
+        return self._rows.get(path)
+
+    def scores(self, target: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Similarity of rows to ``target``, as compute_similarity gives it.
+
+        Args:
+            target: Feature vector to compare against
+            rows: Rows to score (default: all of them)
+
+        Returns:
+            Scores between 0 and 1, one per row; 0 where either vector is all zeros
+        """
+        matrix, nonzero = self.matrix, self.nonzero
+        if rows is not None:
+            matrix, nonzero = matrix[rows], nonzero[rows]
+
+        target_norm = np.linalg.norm(target)
+        if target_norm == 0 or not len(matrix):
+            return np.zeros(len(matrix), dtype=np.float32)
+
+        similarity = matrix @ (np.asarray(target, dtype=np.float32) / target_norm)
+        # Normalize to 0-1 range (cosine similarity is in [-1, 1])
+        similarity += 1
+        similarity /= 2
+        similarity[~nonzero] = 0.0
+        return similarity
+
+    def nearest_rows(self, target: np.ndarray, k: int) -> Optional[np.ndarray]:
+        """
+        Approximately the ``k`` rows nearest ``target``, in row order.
+
+        Uses an HNSW index (built on first use) so a search over a large
+        library need not touch every row. Returns None when every row should
+        be scanned instead: below ANN_MIN_ROWS, or when faiss isn't installed.
+        """
+        if len(self) < ANN_MIN_ROWS or k <= 0:
+            return None
+
+        target_norm = np.linalg.norm(target)
+        if target_norm == 0:
+            return None
+
+        try:
+            import faiss
+        except ImportError:
+            return None
+
+        if self._ann_index is None:
+            # Rows are unit vectors, so inner product is cosine similarity
+            index = faiss.IndexHNSWFlat(self.matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 40
+            index.add(self.matrix)
+            self._ann_index = index
+
+        self._ann_index.hnsw.efSearch = max(64, k)
+        query = (np.asarray(target, dtype=np.float32) / target_norm).reshape(1, -1)
+        _, rows = self._ann_index.search(query, k)
+        rows = rows[0]
+        # faiss pads with -1 when it finds fewer than k
+        return np.sort(rows[rows >= 0])
 
 
 class ImageSimilarityService:
@@ -19,11 +168,13 @@ class ImageSimilarityService:
 
     def __init__(self):
         """Initialize the similarity service with lazy model loading."""
+        # Comparison directory -> its images' features, kept between searches
+        self._directory_features: Dict[str, FeatureMatrix] = {}
         self._ensure_model_loaded()
 
     def _ensure_model_loaded(self):
         """Lazy load the ResNet50 model and transform only when needed."""
-        global _model, _transform
+        global _model, _transform, _device
 
         if _model is not None:
             return
@@ -40,6 +191,35 @@ class ImageSimilarityService:
             # Remove final classification layer to get feature vectors
             _model = torch.nn.Sequential(*list(_model.children())[:-1])
 
+            # Run on the GPU when there is one (CUDA, or Apple silicon's MPS)
+            if torch.cuda.is_available():
+                _device = torch.device('cuda')
+                # Input size is fixed, so let cuDNN pick its fastest kernels
+                # once, and allow TF32 tensor cores for what isn't autocast
+                torch.backends.cudnn.benchmark = True
+                torch.set_float32_matmul_precision('high')
+            elif torch.backends.mps.is_available():
+                _device = torch.device('mps')
+            else:
+                _device = torch.device('cpu')
+            _model = _model.to(_device)
+            if _device.type == 'cuda':
+                # cuDNN's convolutions work in NHWC; storing weights (and,
+                # in _forward, inputs) that way saves a transpose per layer
+                _model = _model.to(memory_format=torch.channels_last)
+
+            if _device.type == 'cpu':
+                # Compile to TorchScript and freeze it (folds batch norm into
+                # the convolutions, drops Python dispatch), which runs
+                # markedly faster on CPU. The graph has no shape-dependent
+                # branches, so one traced example serves any batch size.
+                try:
+                    with torch.no_grad():
+                        traced = torch.jit.trace(_model, torch.randn(1, 3, 224, 224))
+                    _model = torch.jit.optimize_for_inference(traced)
+                except Exception as e:
+                    print(f"TorchScript compilation failed, using eager model: {e}")
+
             # Standard ImageNet preprocessing
             _transform = transforms.Compose([
                 transforms.Resize(256),
@@ -67,34 +247,113 @@ class ImageSimilarityService:
             image_path: Path to the image file
 
         Returns:
-            Numpy array of shape (2048,) or None if extraction fails
+            Unit-length numpy array of shape (2048,) or None if extraction fails
         """
-        if not os.path.exists(image_path):
+        tensor = self._load_tensor(image_path)
+        if tensor is None:
             return None
 
         try:
-            import torch
+            return self._forward([tensor])[0]
+        except Exception as e:
+            print(f"Error extracting features for {image_path}: {e}")
+            return None
 
-            # Load and preprocess image (EXIF orientation applied, so a rotated
-            # photo doesn't read as dissimilar to its own upright duplicate)
-            img = open_oriented(image_path).convert('RGB')
+    def extract_features_batch(
+        self,
+        image_paths: List[str],
+        batch_size: int = FEATURE_BATCH_SIZE,
+        progress_callback=None
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Extract feature vectors for many images, a batch per forward pass.
 
-            img_tensor = _transform(img).unsqueeze(0)  # type: ignore[misc]
+        Images are decoded and preprocessed on a thread pool, then run
+        through the model together, which is far cheaper per image than
+        extract_features one at a time, especially on a GPU. The pool works
+        on the next batch while the model runs the current one, so decoding
+        and inference overlap instead of taking turns.
 
-            # Extract features
-            with torch.no_grad():
-                features = _model(img_tensor)  # type: ignore[misc]
+        Args:
+            image_paths: Paths to the image files
+            batch_size: Images per forward pass
+            progress_callback: Optional callback(done, total) after each batch
 
-            # Convert to numpy array and flatten
-            feature_vector = features.squeeze().numpy()
+        Returns:
+            One unit-length (2048,) array per path, in order; None where
+            extraction failed
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(image_paths)
+        total = len(image_paths)
 
-            return feature_vector
+        with ThreadPoolExecutor(max_workers=PREPROCESS_WORKERS) as executor:
+            def preprocess(start):
+                return [executor.submit(self._load_tensor, path)
+                        for path in image_paths[start:start + batch_size]]
+
+            next_batch = preprocess(0)
+            for start in range(0, total, batch_size):
+                chunk = image_paths[start:start + batch_size]
+                tensors = [future.result() for future in next_batch]
+                # Queue the next batch's decoding before this one's forward
+                # pass, which releases the GIL while it runs
+                next_batch = preprocess(start + batch_size)
+                loaded = [i for i, tensor in enumerate(tensors) if tensor is not None]
+
+                if loaded:
+                    try:
+                        features = self._forward([tensors[i] for i in loaded])
+                        for i, feature_vector in zip(loaded, features):
+                            results[start + i] = feature_vector
+                    except Exception as e:
+                        print(f"Error extracting features for batch at {chunk[0]}: {e}")
 
-        except Exception:
-            import traceback
-            traceback.print_exc()
+                if progress_callback:
+                    progress_callback(start + len(chunk), total)
+
+        return results
+
+    def _load_tensor(self, image_path: str):
+        """Load an image and preprocess it to a (3, 224, 224) tensor, or None."""
+        if not os.path.exists(image_path):
+            return None
+
+        try:
+            # Load and preprocess image (EXIF orientation applied, so a rotated
+            # photo doesn't read as dissimilar to its own upright duplicate)
+            img = open_oriented(image_path, draft_size=FEATURE_DRAFT_SIZE).convert('RGB')
+            return _transform(img)  # type: ignore[misc]
+        except Exception as e:
+            print(f"Error loading {image_path} for feature extraction: {e}")
             return None
 
+    def _forward(self, tensors) -> np.ndarray:
+        """Run preprocessed tensors through the model as one batch: (B, 2048)."""
+        import torch
+
+        batch = torch.stack(tensors)
+        if _device.type == 'cuda':  # type: ignore[union-attr]
+            # Page-locked memory lets the copy below run asynchronously
+            batch = batch.pin_memory()
+            batch = batch.to(_device, non_blocking=True,
+                             memory_format=torch.channels_last)
+        else:
+            batch = batch.to(_device)
+        with torch.inference_mode():
+            if _device.type == 'cuda':  # type: ignore[union-attr]
+                # Half precision is plenty for similarity and much faster on GPU
+                with torch.autocast(device_type='cuda', dtype=torch.float16):
+                    features = _model(batch)  # type: ignore[misc]
+            else:
+                features = _model(batch)  # type: ignore[misc]
+
+        # (B, 2048, 1, 1) -> (B, 2048), as unit vectors: cosine similarity
+        # only needs the direction, and every later comparison and the cache
+        # can then skip the norms.
+        features = features.flatten(1).float().cpu().numpy()
+        _normalize_rows(features)
+        return features
+
     def compute_similarity(self, features1: np.ndarray, features2: np.ndarray) -> float:
         """
         Compute cosine similarity between two feature vectors.
@@ -144,36 +403,102 @@ class ImageSimilarityService:
         if target_features is None:
             return []
 
-        similarities = []
-        processed = 0
-        skipped = 0
-        failed = 0
-
+        # Gather candidates with features into one matrix
+        candidates = []
+        feature_rows = []
         for candidate in candidate_images:
-            # Skip the target image itself
-            if candidate.file_path == target_image.file_path:
-                skipped += 1
-                continue
-
             # Get or extract candidate features
             candidate_features = self._get_cached_features(candidate)
             if candidate_features is None:
-                failed += 1
                 continue
 
-            # Compute similarity
-            similarity = self.compute_similarity(target_features, candidate_features)
+            candidates.append(candidate)
+            feature_rows.append(candidate_features)
 
-            # Only include if above threshold
-            if similarity >= min_similarity:
-                similarities.append((candidate, similarity))
+        features = FeatureMatrix([c.file_path for c in candidates], feature_rows)
+        return [(candidates[row], score) for row, score in self._rank(
+            features, target_features, target_image.file_path, top_k, min_similarity)]
 
-            processed += 1
+    def find_similar_in_matrix(
+        self,
+        target_image,
+        features: FeatureMatrix,
+        top_k: int = 20,
+        min_similarity: float = 0.5
+    ) -> List[Tuple[object, float]]:
+        """
+        Find the most similar images to a target among precomputed features.
+
+        Like find_similar_images, but over a FeatureMatrix (such as a
+        comparison directory's, from get_directory_features), so only the
+        matches are turned into ImageItems.
+
+        Args:
+            target_image: ImageItem to find similar images for
+            features: Feature matrix to search through
+            top_k: Maximum number of similar images to return
+            min_similarity: Minimum similarity threshold (0-1)
+
+        Returns:
+            List of (ImageItem, similarity_score) tuples, sorted by similarity (highest first)
+        """
+        from ..models.image_item import ImageItem
+
+        target_features = self._get_cached_features(target_image)
+        if target_features is None:
+            return []
+
+        results = []
+        for row, score in self._rank(features, target_features, target_image.file_path,
+                                     top_k, min_similarity):
+            item = ImageItem(features.paths[row])
+            item.feature_vector = features.matrix[row]
+            results.append((item, score))
+        return results
+
+    @staticmethod
+    def _rank(
+        features: FeatureMatrix,
+        target_features: np.ndarray,
+        target_path: str,
+        top_k: int,
+        min_similarity: float
+    ) -> List[Tuple[int, float]]:
+        """
+        Rows of ``features`` at or above ``min_similarity`` to the target,
+        best first (ties keep row order), cut to ``top_k``. The target's own
+        row, if present, is skipped. Large matrices may be narrowed to
+        approximate nearest neighbours first (see FeatureMatrix.nearest_rows).
 
-        # Sort by similarity (highest first) and return top_k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        result = similarities[:top_k]
-        return result
+        Returns:
+            List of (row, similarity_score) tuples
+        """
+        # One extra neighbour, in case the target itself is among them.
+        # None means every row is scored, straight off the matrix: indexing
+        # it with all of its rows would copy the whole thing per search.
+        rows = features.nearest_rows(target_features, top_k + 1)
+
+        scores = features.scores(target_features, rows)
+        keep = scores >= min_similarity
+        # Skip the target image itself
+        target_row = features.row_of(target_path)
+        if target_row is not None:
+            if rows is None:
+                keep[target_row] = False
+            else:
+                keep &= rows != target_row
+
+        above = np.flatnonzero(keep)
+        if 0 < top_k < len(above):
+            # Partition out the top_k-th best score in O(N), and sort only
+            # what is at least that good (ties included, so their row order
+            # still decides) rather than every candidate.
+            kth_best = -np.partition(-scores[above], top_k - 1)[top_k - 1]
+            above = above[scores[above] >= kth_best]
+        ranked = above[np.argsort(-scores[above], kind='stable')[:top_k]]
+        if rows is not None:
+            return [(int(rows[i]), float(scores[i])) for i in ranked]
+        return [(int(i), float(scores[i])) for i in ranked]
 
     def _get_cached_features(self, image_item) -> Optional[np.ndarray]:
         """
@@ -185,8 +510,11 @@ class ImageSimilarityService:
         Returns:
             Feature vector as numpy array or None
         """
-        # Check if features are already cached
+        # Check if features are already cached (kept as float32, whatever
+        # they were stored as)
         if hasattr(image_item, 'feature_vector') and image_item.feature_vector is not None:
+            if image_item.feature_vector.dtype != np.float32:
+                image_item.feature_vector = image_item.feature_vector.astype(np.float32)
             return image_item.feature_vector
 
         # Extract and cache features
@@ -210,13 +538,22 @@ class ImageSimilarityService:
             progress_callback: Optional callback function(current, total) for progress updates
         """
         total = len(project.images)
+        missing = [item for item in project.images if item.feature_vector is None]
+        already_cached = total - len(missing)
 
-        for i, image_item in enumerate(project.images):
-            # Extract features (will be cached automatically)
-            self._get_cached_features(image_item)
-
+        def on_batch(done, _batch_total):
             if progress_callback:
-                progress_callback(i + 1, total)
+                progress_callback(already_cached + done, total)
+
+        # Extract what isn't cached yet, a batch per forward pass
+        features = self.extract_features_batch(
+            [item.file_path for item in missing], progress_callback=on_batch)
+        for image_item, feature_vector in zip(missing, features):
+            if feature_vector is not None:
+                image_item.feature_vector = feature_vector
+
+        if progress_callback and not missing:
+            progress_callback(total, total)
 
         print(f"Precomputed features for {total} images")
 
@@ -227,7 +564,7 @@ class ImageSimilarityService:
         progress_callback=None
     ) -> List[Dict]:
         """
-        Load images from a directory (top level only, no recursion) with parallel feature extraction.
+        Load images from a directory (top level only, no recursion) with batched feature extraction.
 
         Args:
             directory: Path to the directory containing images
@@ -243,120 +580,273 @@ class ImageSimilarityService:
         # Load cache
         cache = self._load_cache_from_disk(directory)
 
-        # Collect all image paths
+        # Collect all image paths. scandir's entries usually know their type
+        # from the directory listing itself, so is_file() costs no extra stat.
+        formats = frozenset(fmt.lower() for fmt in supported_formats)
         image_paths = []
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Check if file has supported format
+                _, ext = os.path.splitext(entry.name)
+                if ext.lower() not in formats:
+                    continue
 
-            # Skip directories and non-files
-            if not os.path.isfile(file_path):
-                continue
+                # Skip directories and non-files
+                if not entry.is_file():
+                    continue
 
-            # Check if file has supported format
-            _, ext = os.path.splitext(filename)
-            if ext.lower() not in [fmt.lower() for fmt in supported_formats]:
-                continue
-
-            image_paths.append(file_path)
+                image_paths.append(entry.path)
 
         if not image_paths:
             return []
 
         total = len(image_paths)
-        images = []
+        cached_paths = []
         paths_needing_extraction = []
 
         # First pass: collect paths that need feature extraction
         for file_path in image_paths:
-            features = cache.get(file_path)
-            if features is None:
-                paths_needing_extraction.append(file_path)
+            if file_path in cache:
+                cached_paths.append(file_path)
             else:
-                images.append({'path': file_path, 'features': features})
+                paths_needing_extraction.append(file_path)
 
         # If no extraction needed, return cached results
         if not paths_needing_extraction:
+            images = [{'path': path, 'features': cache[path]} for path in cached_paths]
+            self._update_directory_features(directory, images)
             return images
 
-        # Parallel feature extraction for uncached images
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all extraction tasks
-            future_to_path = {
-                executor.submit(self.extract_features, path): path
-                for path in paths_needing_extraction
-            }
-
-            # Process completed tasks
-            completed = 0
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
-                try:
-                    features = future.result()
-                    if features is not None:
-                        cache[path] = features
-                        images.append({'path': path, 'features': features})
-                    else:
-                        images.append({'path': path, 'features': None})
-                except Exception as e:
-                    print(f"Error extracting features for {path}: {e}")
-                    images.append({'path': path, 'features': None})
+        # Cached rows are only picked up from ``cache`` once saving is done:
+        # a save that rewrites the cache file swaps its memory-mapped rows
+        # for copies, and no other reference may keep the old mapping open.
+        extracted_images = []
+
+        # Batched feature extraction for uncached images, saving as we go:
+        # each save only appends the rows added since the last one
+        for start in range(0, len(paths_needing_extraction), CACHE_CHECKPOINT_IMAGES):
+            chunk = paths_needing_extraction[start:start + CACHE_CHECKPOINT_IMAGES]
+            done_before = total - len(paths_needing_extraction) + start
 
-                completed += 1
+            def on_batch(done, _batch_total, done_before=done_before):
                 if progress_callback:
                     # Report progress based on total images
-                    current = len(image_paths) - len(paths_needing_extraction) + completed
-                    progress_callback(current, total)
+                    progress_callback(done_before + done, total)
+
+            extracted = self.extract_features_batch(chunk, progress_callback=on_batch)
+
+            for path, features in zip(chunk, extracted):
+                if features is not None:
+                    cache[path] = features
+                extracted_images.append({'path': path, 'features': features})
 
-        # Save updated cache
-        self._save_cache_to_disk(directory, cache)
+            # Save updated cache
+            self._save_cache_to_disk(directory, cache)
 
+        images = [{'path': path, 'features': cache[path]} for path in cached_paths]
+        images.extend(extracted_images)
+        self._update_directory_features(directory, images)
         return images
 
-    def _get_cache_path(self, directory: str) -> str:
-        """Get the path to the cache file for a directory."""
+    def get_directory_features(self, directory: str) -> Optional[FeatureMatrix]:
+        """Features from the last load_images_from_directory of ``directory``."""
+        return self._directory_features.get(directory)
+
+    def _update_directory_features(self, directory: str, images: List[Dict]):
+        """
+        Keep ``directory``'s FeatureMatrix in step with a fresh load.
+
+        The matrix is only rebuilt when the set of images with features has
+        changed, so repeated searches against one directory reuse it.
+        """
+        loaded = [img for img in images if img['features'] is not None]
+        paths = [img['path'] for img in loaded]
+        current = self._directory_features.get(directory)
+        if current is not None and current.paths == paths:
+            return
+        self._directory_features[directory] = FeatureMatrix(
+            paths, [img['features'] for img in loaded])
+
+    def _get_cache_path(self, directory: str, file_name: str) -> str:
+        """Get the path to one of the cache files for a directory."""
         cache_dir = os.path.join(directory, CACHE_FOLDER_NAME)
-        return os.path.join(cache_dir, CACHE_FILE_NAME)
+        return os.path.join(cache_dir, file_name)
 
     def _load_cache_from_disk(self, directory: str) -> Dict[str, np.ndarray]:
         """
         Load feature vector cache from disk.
 
+        The feature rows are memory-mapped, so they are only read from disk
+        when they are used.
+
         Returns:
             Dictionary mapping image_path -> feature_vector (as numpy array)
         """
-        cache_path = self._get_cache_path(directory)
+        index = self._read_cache_index(directory)
+        if index is None:
+            return self._load_legacy_cache(directory)
 
-        if not os.path.exists(cache_path):
+        paths = index["paths"]
+        if not paths:
             return {}
 
         try:
-            loaded = np.load(cache_path, allow_pickle=True)
-            # Convert from numpy archive to regular dict
-            cache = {key: loaded[key] for key in loaded.files}
-            return cache
+            matrix = np.memmap(self._get_cache_path(directory, CACHE_FEATURES_FILE),
+                               dtype=np.float16, mode='r',
+                               shape=(len(paths), index["dim"]))
+            # Each path maps to a view of its row
+            return dict(zip(paths, matrix))
         except Exception:
             return {}
 
+    def _read_cache_index(self, directory: str) -> Optional[Dict]:
+        """The cache's {'dim': int, 'paths': [...]} index, or None if there is none."""
+        index_path = self._get_cache_path(directory, CACHE_INDEX_FILE)
+        features_path = self._get_cache_path(directory, CACHE_FEATURES_FILE)
+
+        if not os.path.exists(index_path) or not os.path.exists(features_path):
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _load_legacy_cache(self, directory: str) -> Dict[str, np.ndarray]:
+        """Load a cache written by earlier versions, if there is one."""
+        matrix_path = self._get_cache_path(directory, LEGACY_MATRIX_FILE)
+        paths_path = self._get_cache_path(directory, LEGACY_PATHS_FILE)
+        cache_path = self._get_cache_path(directory, LEGACY_CACHE_FILE_NAME)
+
+        try:
+            if os.path.exists(matrix_path) and os.path.exists(paths_path):
+                # A .npy matrix and a JSON list of its rows' paths
+                with open(paths_path, 'r', encoding='utf-8') as f:
+                    paths = json.load(f)
+                matrix = np.load(matrix_path, mmap_mode='r')
+                return dict(zip(paths, matrix)) if len(matrix) == len(paths) else {}
+
+            if os.path.exists(cache_path):
+                with np.load(cache_path, allow_pickle=True) as loaded:
+                    if LEGACY_PATHS_KEY in loaded.files and LEGACY_FEATURES_KEY in loaded.files:
+                        # One float16 matrix of rows
+                        paths = loaded[LEGACY_PATHS_KEY].tolist()
+                        return dict(zip(paths, loaded[LEGACY_FEATURES_KEY]))
+                    # One float32 array per path
+                    return {key: loaded[key] for key in loaded.files}
+        except Exception:
+            pass
+        return {}
+
+    @staticmethod
+    def _cache_rows(cache: Dict[str, np.ndarray], paths: List[str]) -> np.ndarray:
+        """
+        The cache's vectors for ``paths`` as L2-normalized float16 rows.
+
+        Similarity is cosine, so normalizing loses nothing and keeps the
+        values well inside float16's range.
+        """
+        if not paths:
+            return np.empty((0, 0), dtype=np.float16)
+        rows = np.stack([np.asarray(cache[path], dtype=np.float32) for path in paths])
+        _normalize_rows(rows)
+        return rows.astype(np.float16)
+
     def _save_cache_to_disk(self, directory: str, cache: Dict[str, np.ndarray]):
         """
         Save feature vector cache to disk.
 
+        When the cache on disk holds the first entries of ``cache`` (the
+        usual case: it was loaded, then new images were added), only the new
+        rows are written, appended in place. Otherwise the cache is
+        rewritten.
+
         Args:
             directory: Directory containing the images
             cache: Dictionary mapping image_path -> feature_vector (as numpy array)
         """
         cache_dir = os.path.join(directory, CACHE_FOLDER_NAME)
-        cache_path = self._get_cache_path(directory)
-
-        try:
-            # Create cache directory if it doesn't exist
-            os.makedirs(cache_dir, exist_ok=True)
-
-            # Save cache as compressed numpy archive
-            np.savez_compressed(cache_path, **cache)  # type: ignore[arg-type]
-
-        except Exception:
-            pass
+        features_path = self._get_cache_path(directory, CACHE_FEATURES_FILE)
+        index_path = self._get_cache_path(directory, CACHE_INDEX_FILE)
+
+        # Held from reading the index to writing it back
+        with _cache_lock(directory):
+            try:
+                # Create cache directory if it doesn't exist
+                os.makedirs(cache_dir, exist_ok=True)
+
+                paths = list(cache)
+                index = self._read_cache_index(directory)
+                saved = index["paths"] if index is not None else []
+                appending = index is not None and paths[:len(saved)] == saved
+
+                if appending and len(paths) == len(saved):
+                    return  # Nothing new
+
+                rows = self._cache_rows(cache, paths[len(saved):] if appending else paths)
+                if appending and saved and rows.shape[1] != index["dim"]:  # type: ignore[index]
+                    # Different vector length (a different model); start over
+                    appending = False
+                    rows = self._cache_rows(cache, paths)
+                dim = rows.shape[1]
+
+                if appending:
+                    # Write the new rows straight after the indexed ones. The file
+                    # is never truncated, since it may be memory-mapped; anything
+                    # past the indexed rows is left over from an interrupted save
+                    # and is overwritten.
+                    with open(features_path, 'r+b') as f:
+                        f.seek(len(saved) * dim * rows.itemsize)
+                        f.write(rows.tobytes())
+                else:
+                    # ``cache`` may hold views of the memory-mapped file being
+                    # replaced (or of a legacy .npy about to be removed). Copy
+                    # them into memory first: Windows can't replace or delete a
+                    # file while a mapping of it is open.
+                    for path, vector in cache.items():
+                        if isinstance(vector, np.memmap):
+                            cache[path] = np.array(vector)
+
+                    # Write to a temporary file and swap it in, so an interrupted
+                    # save leaves the previous cache whole
+                    with open(features_path + '.tmp', 'wb') as f:
+                        f.write(rows.tobytes())
+                    os.replace(features_path + '.tmp', features_path)
+
+                # The index goes last, so the rows it lists are always on disk
+                with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump({"dim": dim, "paths": paths}, f)
+                os.replace(index_path + '.tmp', index_path)
+
+                for legacy_name in (LEGACY_MATRIX_FILE, LEGACY_PATHS_FILE, LEGACY_CACHE_FILE_NAME):
+                    legacy_path = self._get_cache_path(directory, legacy_name)
+                    if os.path.exists(legacy_path):
+                        os.remove(legacy_path)
+
+            except Exception as e:
+                print(f"Error saving feature cache for {directory}: {e}")
+
+
+_shared_service: Optional[ImageSimilarityService] = None
+_shared_service_lock = threading.Lock()
+
+
+def get_similarity_service() -> ImageSimilarityService:
+    """
+    The process-wide ImageSimilarityService, created on first use.
+
+    Everything that searches or indexes should go through here, so the
+    per-directory feature matrices one caller loads (e.g. the printed-photo
+    import) are already in memory for the next (the Find Similar dialog).
+    Construction loads the model, so like the constructor this can raise
+    ImportError; a failed attempt is retried on the next call.
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = ImageSimilarityService()
+        return _shared_service
 
 
 class SimilaritySearchWorker(QThread):
@@ -386,7 +876,7 @@ class SimilaritySearchWorker(QThread):
     def run(self):
         """Run similarity search in background."""
         try:
-            # Load comparison images with parallel feature extraction
+            # Load comparison images with batched feature extraction
             def on_progress(current, total):
                 if not self.cancelled:
                     self.progress_updated.emit(current, total, f"Processing image {current}/{total}")
@@ -403,25 +893,20 @@ class SimilaritySearchWorker(QThread):
                 self.search_complete.emit([])
                 return
 
-            # Convert to ImageItem-like objects for find_similar_images
-            from ..models.image_item import ImageItem
-
-            candidate_items = []
-            for img_dict in comparison_images:
-                if img_dict['features'] is not None:
-                    item = ImageItem(img_dict['path'])
-                    item.feature_vector = img_dict['features']
-                    candidate_items.append(item)
-
             self.progress_updated.emit(0, 0, "Finding similar images...")
 
-            # Find similar images
-            results = self.similarity_service.find_similar_images(
-                self.target_image,
-                candidate_items,
-                top_k=self.top_k,
-                min_similarity=self.min_similarity
-            )
+            # Search the directory's feature matrix, kept by the service
+            # between searches; only the matches become ImageItems.
+            features = self.similarity_service.get_directory_features(
+                self.comparison_directory)
+            results = []
+            if comparison_images and features is not None:
+                results = self.similarity_service.find_similar_in_matrix(
+                    self.target_image,
+                    features,
+                    top_k=self.top_k,
+                    min_similarity=self.min_similarity
+                )
 
             self.search_complete.emit(results)
 
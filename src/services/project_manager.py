@@ -2,11 +2,80 @@ import json
 import os
 import shutil
 import zipfile
-from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from ..models.project import Project
 from ..utils.paths import get_user_data_dir
 from PIL import Image
 
+# Image files that archiving and importing make thumbnails of
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.heic'})
+
+# Threads making archive thumbnails. Pillow releases the GIL while it
+# decodes, resizes and encodes, so these run on separate cores.
+THUMBNAIL_WORKERS = os.cpu_count() or 1
+
+# Output files that are compressed already. Deflating them again costs most
+# of the archive's zipping time for next to no saving, so they are stored.
+ZIP_STORED_EXTENSIONS = IMAGE_EXTENSIONS
+# Chunk size for copying files into the archive zip (ZipFile.write uses
+# 8 KiB, i.e. hundreds of reads and writes for one photo)
+ZIP_COPY_BUFFER = 1 << 20
+
+
+def _make_thumbnails(jobs: List[Tuple[str, str]], thumbnail_size: int) -> int:
+    """Save each (src_path, thumb_path) job as a JPEG thumbnail, in order.
+
+    Sources whose thumbnails may be the same file are handled together, one
+    after the other, so the last one wins as it would in a plain loop.
+
+    Returns:
+        Number of thumbnails saved
+    """
+    created = 0
+    for src_path, thumb_path in jobs:
+        try:
+            # Open image and create thumbnail
+            with Image.open(src_path) as img:
+
+                # Convert to RGB if necessary
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    img = img.convert('RGB')
+
+                # Calculate thumbnail size maintaining aspect ratio
+                img.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
+
+                # Save as JPG to printed folder
+                img.save(thumb_path, 'JPEG', quality=85)
+
+                created += 1
+        except Exception:
+            import traceback
+            traceback.print_exc()
+    return created
+
+
+def _iter_files(folder: str):
+    """Yield a DirEntry for every file under folder, in os.walk's order.
+
+    Like os.walk (which doesn't follow symlinked folders, and skips folders
+    it can't list), but scandir's entries already know their type, so no
+    file costs an extra stat.
+    """
+    subfolders = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subfolders.append(entry.path)
+                else:
+                    yield entry
+    except OSError:
+        return
+    for subfolder in subfolders:
+        yield from _iter_files(subfolder)
+
 
 class ProjectManager:
     """Service for managing projects: CRUD operations and persistence."""
@@ -32,38 +101,79 @@ class ProjectManager:
 
         self.projects_file = os.path.join(self.data_dir, "projects.json")
         self.projects: List[Project] = []
+        # The same projects by name, kept in step with self.projects so that
+        # name lookups don't scan the list
+        self._by_name: Dict[str, Project] = {}
+        # (mtime_ns, size) of the projects.json self.projects was parsed
+        # from, while nothing has been saved since
+        self._loaded_stat: Optional[tuple] = None
+        # Whether data_dir is known to exist, so each save needn't check
+        self._data_dir_ready = False
+
+    def _add_project(self, project: Project):
+        """Track a new project (the first one registered under a name wins lookups)."""
+        self.projects.append(project)
+        self._by_name.setdefault(project.name, project)
 
     def load_projects(self) -> List[Project]:
-        """Load all projects from projects.json."""
+        """Load all projects from projects.json.
+
+        If the file hasn't changed since it was last loaded, and nothing was
+        saved since, the projects already in memory are kept as they are.
+        """
+        try:
+            st = os.stat(self.projects_file)
+            file_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            file_stat = None
+
+        if file_stat is not None and file_stat == self._loaded_stat:
+            self._discover_workspace_projects()
+            return self.projects
+
         self.projects.clear()
+        self._by_name.clear()
+        self._loaded_stat = None
 
-        if os.path.exists(self.projects_file):
+        # Whether every project in projects.json was read
+        complete = True
+        if file_stat is not None:
             try:
                 with open(self.projects_file, 'r') as f:
                     data = json.load(f)
-                    for project_data in data.get("projects", []):
-                        project = Project.from_dict(project_data)
-                        self.projects.append(project)
+                for project_data in data.get("projects", []):
+                    try:
+                        self._add_project(Project.from_dict(project_data))
+                    except Exception as e:
+                        # Skip just this entry; the rest still load
+                        complete = False
+                        print(f"Error loading project entry {project_data!r:.80}: {e}")
+                if complete:
+                    self._loaded_stat = file_stat
 
             except json.JSONDecodeError as e:
+                complete = False
                 print(f"Error loading projects.json: {e}")
             except Exception as e:
+                complete = False
                 print(f"Error loading projects: {e}")
 
-        # Auto-register any folders dropped into the workspace that aren't tracked yet
-        self._discover_workspace_projects()
+        # Auto-register any folders dropped into the workspace that aren't
+        # tracked yet. If projects.json couldn't be read in full, don't let
+        # that save over it: the projects it failed to load would be lost.
+        self._discover_workspace_projects(save=complete)
 
         return self.projects
 
     # Folders at the workspace root that are never treated as projects
     _RESERVED_FOLDERS = {".album-studio-settings", "_past_printed", "printed"}
 
-    def _discover_workspace_projects(self):
+    def _discover_workspace_projects(self, save: bool = True):
         """Scan the workspace root for unregistered project folders and add them.
 
         A subfolder qualifies as a project if it contains an 'input' subfolder.
         Newly discovered projects get an 'output' folder created if missing and
-        are persisted to projects.json.
+        are persisted to projects.json, unless save is False.
         """
         if not self.workspace_directory or not os.path.isdir(self.workspace_directory):
             return
@@ -101,27 +211,50 @@ class ProjectManager:
                 print(f"Failed to create output folder for '{name}': {e}")
                 continue
 
-            self.projects.append(Project(name, input_folder, output_folder))
+            self._add_project(Project(name, input_folder, output_folder))
             discovered = True
 
-        if discovered:
+        if discovered and save:
             self.save_projects()
 
     def save_projects(self):
         """Save all projects to projects.json."""
+        self._loaded_stat = None
         try:
-            os.makedirs(self.data_dir, exist_ok=True)
+            if not self._data_dir_ready:
+                os.makedirs(self.data_dir, exist_ok=True)
+                self._data_dir_ready = True
 
             data = {
                 "projects": [project.to_dict() for project in self.projects]
             }
 
-            with open(self.projects_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            try:
+                self._write_projects_file(data)
+            except FileNotFoundError:
+                # The folder was removed since it was last checked; recreate
+                # it and write again now, rather than losing this change
+                os.makedirs(self.data_dir, exist_ok=True)
+                self._write_projects_file(data)
 
         except Exception as e:
+            # Check the folder again next time, in case it was removed
+            self._data_dir_ready = False
             print(f"Error saving projects: {e}")
 
+    def _write_projects_file(self, data: dict):
+        """Write ``data`` to projects.json through a temporary file."""
+        # Write beside the real file and swap it in, so a crash or a full
+        # disk mid-write leaves the previous projects.json intact rather
+        # than a truncated one that load_projects can't parse.
+        tmp_file = self.projects_file + '.tmp'
+        # Compact, because the file is only ever read back by the app:
+        # pretty-printing forces json onto its pure-Python encoder, which
+        # made saving a large workspace several times slower
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_file, self.projects_file)
+
     def create_project(self, name: str, workspace_directory: str) -> Optional[Project]:
         """Create a new project with automatic folder structure.
 
@@ -157,7 +290,7 @@ class ProjectManager:
 
         # Create project
         project = Project(name, input_folder, output_folder)
-        self.projects.append(project)
+        self._add_project(project)
         self.save_projects()
 
         return project
@@ -167,6 +300,12 @@ class ProjectManager:
         project = self.get_project_by_name(name)
         if project:
             self.projects.remove(project)
+            del self._by_name[name]
+            # A same-named duplicate (from a hand-edited projects.json) takes over
+            for other in self.projects:
+                if other.name == name:
+                    self._by_name[name] = other
+                    break
             self.save_projects()
             return True
         else:
@@ -174,22 +313,26 @@ class ProjectManager:
 
     def get_project_by_name(self, name: str) -> Optional[Project]:
         """Get a project by its name."""
-        for project in self.projects:
-            if project.name == name:
-                return project
-        return None
+        return self._by_name.get(name)
 
     def get_project_names(self) -> List[str]:
         """Get list of all project names."""
         return [project.name for project in self.projects]
 
-    def save_project(self, project: Project):
-        """Save a specific project (updates projects.json and individual project data file)."""
+    def save_project(self, project: Project, central: bool = True):
+        """Save a specific project (updates projects.json and individual project data file).
+
+        Args:
+            project: Project to save
+            central: Also rewrite projects.json. Callers saving several
+                projects pass False and call save_projects() once at the end.
+        """
         # Save project-specific data (tags and crop positions)
         project.save_project_data(self.data_dir)
 
         # Also save to central projects.json for backwards compatibility
-        self.save_projects()
+        if central:
+            self.save_projects()
 
     def clear_tags_for_deleted_sizes(self, deleted_size_ids: set, deleted_size_groups: set):
         """Clear tags from images if their size or size group was deleted.
@@ -198,31 +341,41 @@ class ProjectManager:
             deleted_size_ids: Set of size IDs that were deleted
             deleted_size_groups: Set of size group names that were deleted
         """
+        if not deleted_size_ids and not deleted_size_groups:
+            return
+
         total_cleared = 0
 
         for project in self.projects:
+            project_cleared = 0
             for image_item in project.images:
+                if not image_item.album_tag and not image_item.size_tag:
+                    continue
                 # Clear if size group was deleted
                 if image_item.album_tag in deleted_size_groups:
-                    if image_item.album_tag or image_item.size_tag:
-                        image_item.album_tag = None
-                        image_item.size_tag = None
-                        total_cleared += 1
+                    image_item.album_tag = None
+                    image_item.size_tag = None
+                    project_cleared += 1
                 # Clear if size was deleted
-                elif image_item.size_tag in deleted_size_ids:
-                    if image_item.size_tag:
-                        image_item.size_tag = None
-                        total_cleared += 1
+                elif image_item.size_tag and image_item.size_tag in deleted_size_ids:
+                    image_item.size_tag = None
+                    project_cleared += 1
 
-            # Save project if any tags were cleared
-            if total_cleared > 0:
-                self.save_project(project)
+            # Save the data file of each project whose tags changed
+            if project_cleared:
+                self.save_project(project, central=False)
+                total_cleared += project_cleared
+
+        # ...and projects.json once, not once per project
+        if total_cleared:
+            self.save_projects()
 
     def archive_project(
             self,
             project_name: str,
             workspace_dir: Optional[str] = None,
-            thumbnail_size: int = 200) -> dict:
+            thumbnail_size: int = 200,
+            progress_callback: Optional[Callable[[int, int, str], None]] = None) -> dict:
         """Archive a project by:
         1. Creating thumbnails of all output folder images → save to '_past_printed' folder at workspace root
         2. Zipping the output folder → save to workspace root
@@ -233,6 +386,7 @@ class ProjectManager:
             project_name: Name of the project to archive
             workspace_dir: Workspace directory root (for _past_printed folder and zip location)
             thumbnail_size: Maximum size for thumbnail (default 800px)
+            progress_callback: Optional callback(current, total, phase_text) for progress
 
         Returns:
             dict with stats about the archive operation
@@ -266,43 +420,33 @@ class ProjectManager:
 
         os.makedirs(printed_folder, exist_ok=True)
 
+        # List the output folder once, for both the thumbnails and the zip
+        output_files = []
         if os.path.exists(project.output_folder):
-
-            # Count files before processing
-            total_files = 0
-            for root, _, files in os.walk(project.output_folder):
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg', '.png', '.heic')):
-                        total_files += 1
-
-            # Process files
-            for root, _, files in os.walk(project.output_folder):
-
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg', '.png', '.heic')):
-                        src_path = os.path.join(root, file)
-                        try:
-                            # Open image and create thumbnail
-                            with Image.open(src_path) as img:
-
-                                # Convert to RGB if necessary
-                                if img.mode in ('RGBA', 'LA', 'P'):
-                                    img = img.convert('RGB')
-
-                                # Calculate thumbnail size maintaining aspect ratio
-                                img.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
-
-                                # Save as JPG to printed folder
-                                base_name = os.path.splitext(file)[0]
-                                thumb_path = os.path.join(printed_folder, f"{base_name}.jpg")
-                                img.save(thumb_path, 'JPEG', quality=85)
-
-                                stats['thumbnails_created'] += 1
-                        except Exception:
-                            import traceback
-                            traceback.print_exc()
-                    else:
-                        pass
+            output_files = list(_iter_files(project.output_folder))
+
+            # Group sources by thumbnail name, then make the groups in parallel.
+            # The name is case-folded: on Windows and macOS 'IMG_1.jpg' and
+            # 'img_1.jpg' are one file, which two threads mustn't write at once.
+            thumbnail_jobs: Dict[str, List[Tuple[str, str]]] = {}
+            for entry in output_files:
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    base_name = os.path.splitext(entry.name)[0]
+                    thumb_path = os.path.join(printed_folder, f"{base_name}.jpg")
+                    key = os.path.normcase(thumb_path).lower()
+                    thumbnail_jobs.setdefault(key, []).append((entry.path, thumb_path))
+
+            if thumbnail_jobs:
+                workers = min(THUMBNAIL_WORKERS, len(thumbnail_jobs))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    created = executor.map(
+                        _make_thumbnails,
+                        thumbnail_jobs.values(),
+                        [thumbnail_size] * len(thumbnail_jobs))
+                    for i, count in enumerate(created, 1):
+                        stats['thumbnails_created'] += count
+                        if progress_callback:
+                            progress_callback(i, len(thumbnail_jobs), "Creating thumbnails")
         else:
             pass
 
@@ -311,17 +455,18 @@ class ProjectManager:
             zip_path = os.path.join(zip_location, f"{project_name}_output.zip")
 
             try:
-                # Count files to zip
-                zip_file_count = 0
-                for root, _, files in os.walk(project.output_folder):
-                    zip_file_count += len(files)
-
                 with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, _, files in os.walk(project.output_folder):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, os.path.dirname(project.output_folder))
-                            zipf.write(file_path, arcname)
+                    for i, entry in enumerate(output_files, 1):
+                        arcname = os.path.relpath(entry.path, os.path.dirname(project.output_folder))
+                        zinfo = zipfile.ZipInfo.from_file(entry.path, arcname)
+                        if os.path.splitext(entry.name)[1].lower() in ZIP_STORED_EXTENSIONS:
+                            zinfo.compress_type = zipfile.ZIP_STORED
+                        else:
+                            zinfo.compress_type = zipfile.ZIP_DEFLATED
+                        with open(entry.path, 'rb') as src, zipf.open(zinfo, 'w') as dst:
+                            shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER)
+                        if progress_callback:
+                            progress_callback(i, len(output_files), "Zipping output")
 
                 # Verify zip was created
                 if os.path.exists(zip_path):
@@ -374,7 +519,6 @@ class ProjectManager:
         Returns:
             dict with {'imported': int, 'skipped': int}
         """
-        supported_extensions = ('.jpg', '.jpeg', '.png', '.heic')
         printed_folder = os.path.join(workspace_dir, "_past_printed")
         os.makedirs(printed_folder, exist_ok=True)
 
@@ -383,8 +527,10 @@ class ProjectManager:
         # Collect source image paths (top-level only)
         source_files = []
         for filename in os.listdir(source_dir):
+            if os.path.splitext(filename)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
             file_path = os.path.join(source_dir, filename)
-            if os.path.isfile(file_path) and filename.lower().endswith(supported_extensions):
+            if os.path.isfile(file_path):
                 source_files.append(file_path)
 
         total = len(source_files)
@@ -88,8 +88,8 @@ class ImportPrintedWorker(QThread):
 
         # Phase 2: Extract features (vectorize)
         try:
-            from src.services.image_similarity_service import ImageSimilarityService
-            service = ImageSimilarityService()
+            from src.services.image_similarity_service import get_similarity_service
+            service = get_similarity_service()
             printed_folder = os.path.join(self.workspace_dir, "_past_printed")
             supported = ['.jpg', '.jpeg', '.png', '.heic']
 
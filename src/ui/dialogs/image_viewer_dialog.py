@@ -129,8 +129,9 @@ def _apply_date_stamp(img, image_item, config):
         display_date = image_item.get_display_date()
         if not display_date:
             return img
+        # The caller's crop is a throwaway copy, so stamp it in place.
         return DateStampService(config).apply_date_stamp(
-            img, display_date, image_item.size_tag)
+            img, display_date, image_item.size_tag, in_place=True)
     except Exception as e:
         print(f"Error applying date stamp preview: {e}")
         return img
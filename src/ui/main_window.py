@@ -12,7 +12,7 @@ from ..models.config import Config
 from ..services.project_manager import ProjectManager
 from ..services.image_processor import ImageProcessor
 from ..services.crop_service import CropService, CropWorker
-from ..services.image_similarity_service import ImageSimilarityService
+from ..services.image_similarity_service import get_similarity_service
 from ..services.update_service import UpdateService, ReleaseInfo
 from ..services.server_sync_service import (
     ServerSyncService, ServerSyncError, RemotePhoto)
@@ -191,6 +191,56 @@ class PullDownloadWorker(QThread):
         })
 
 
+class ArchiveWorker(QThread):
+    """Background worker that archives a project (thumbnails, zip, delete)."""
+    progress_updated = pyqtSignal(int, int, str)  # current, total, phase_text
+    archive_complete = pyqtSignal(dict)  # stats dict
+    error = pyqtSignal(str)
+
+    def __init__(self, project_manager: ProjectManager, project_name: str,
+                 workspace_dir: str):
+        super().__init__()
+        self.project_manager = project_manager
+        self.project_name = project_name
+        self.workspace_dir = workspace_dir
+
+    def run(self):
+        try:
+            stats = self.project_manager.archive_project(
+                self.project_name, workspace_dir=self.workspace_dir,
+                progress_callback=self.progress_updated.emit)
+            self.archive_complete.emit(stats)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class BlockingProgressDialog(QProgressDialog):
+    """Progress dialog the user can't dismiss, for work that can't be stopped.
+
+    Escape (which goes through reject) and the window's close button are
+    ignored until finish() is called.
+    """
+
+    def __init__(self, label_text: str, parent=None):
+        super().__init__(label_text, None, 0, 0, parent)
+        self._can_close = False
+
+    def finish(self):
+        """Allow the dialog to close, and close it."""
+        self._can_close = True
+        self.close()
+
+    def reject(self):
+        if self._can_close:
+            super().reject()
+
+    def closeEvent(self, event):
+        if self._can_close:
+            super().closeEvent(event)
+        else:
+            event.ignore()
+
+
 class MainWindow(QMainWindow):
     """Main application window."""
 
@@ -217,6 +267,7 @@ class MainWindow(QMainWindow):
         self._update_download_worker: Optional[UpdateDownloadWorker] = None
         self._pull_list_worker: Optional[PullListWorker] = None
         self._pull_download_worker: Optional[PullDownloadWorker] = None
+        self._archive_worker: Optional[ArchiveWorker] = None
 
         self.init_ui()
         self.load_projects()
@@ -387,6 +438,8 @@ class MainWindow(QMainWindow):
                 from .dialogs.config_dialog import ConfigDialog
                 dialog = ConfigDialog(self.config, self.project_manager, self)
                 if dialog.exec() == dialog.DialogCode.Accepted:
+                    self.crop_service.date_stamp_service.refresh_settings()
+
                     # Check if workspace was set
                     workspace_directory = self.config.get_setting("workspace_directory", "")
                     if not workspace_directory:
@@ -414,6 +467,9 @@ class MainWindow(QMainWindow):
         """Handle archive project request."""
         if not project_name:
             return
+        # One archive at a time; the button is disabled meanwhile
+        if self._archive_worker is not None:
+            return
 
         # Show confirmation dialog with detailed info
         reply = QMessageBox.question(
@@ -433,15 +489,29 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # Show busy cursor
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        # Archive in the background; it can't be stopped half-way, so the
+        # dialog only shows progress and can't be dismissed until it ends
+        progress = BlockingProgressDialog("Preparing to archive...", self)
+        progress.setWindowTitle("Archiving Project")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        # Stay open between phases, each of which runs the bar to its end
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.setValue(0)
 
-        try:
-            # Archive the project
-            workspace_dir = self.config.get_setting("workspace_directory", "")
-            stats = self.project_manager.archive_project(project_name, workspace_dir=workspace_dir)
+        workspace_dir = self.config.get_setting("workspace_directory", "")
+        worker = ArchiveWorker(self.project_manager, project_name, workspace_dir)
+        self._archive_worker = worker
+        self.project_toolbar.archive_project_btn.setEnabled(False)
 
-            QApplication.restoreOverrideCursor()
+        def on_progress(current, total, phase):
+            progress.setMaximum(total)
+            progress.setValue(current)
+            progress.setLabelText(f"{phase}: {current}/{total}")
+
+        def on_complete(stats):
+            progress.finish()
 
             # Clear current project if it's the one being archived
             if self.current_project and self.current_project.name == project_name:
@@ -463,14 +533,26 @@ class MainWindow(QMainWindow):
                 f"Project removed: {'Yes' if stats['project_removed'] else 'No'}"
             )
 
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
+        def on_error(message):
+            progress.finish()
             QMessageBox.critical(
                 self,
                 "Archive Failed",
-                f"Failed to archive project: {str(e)}"
+                f"Failed to archive project: {message}"
             )
 
+        worker.progress_updated.connect(on_progress)
+        worker.archive_complete.connect(on_complete)
+        worker.error.connect(on_error)
+        worker.finished.connect(self._on_archive_finished)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def _on_archive_finished(self):
+        """Let the next archive start once the worker has stopped."""
+        self._archive_worker = None
+        self.project_toolbar.archive_project_btn.setEnabled(True)
+
     def on_add_photo_requested(self):
         """Handle add photo request."""
         if not self.current_project:
@@ -1168,6 +1250,9 @@ class MainWindow(QMainWindow):
 
         dialog = ConfigDialog(self.config, self.project_manager, self)
         if dialog.exec() == dialog.DialogCode.Accepted:
+            # The export path's date stamp service snapshots its settings
+            self.crop_service.date_stamp_service.refresh_settings()
+
             # Reload UI components after config changes
             self.tag_panel.load_size_group()
 
@@ -1200,7 +1285,7 @@ class MainWindow(QMainWindow):
         # Lazy load similarity service
         if self.similarity_service is None:
             try:
-                self.similarity_service = ImageSimilarityService()
+                self.similarity_service = get_similarity_service()
             except ImportError as e:
                 QMessageBox.critical(
                     self,
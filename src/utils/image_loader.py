@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Optional, Tuple
 from PIL import Image, ImageOps
 from PyQt6.QtGui import QPixmap, QImage, QImageReader
 from PyQt6.QtCore import Qt, QSize
@@ -9,7 +9,8 @@ import pillow_heif
 pillow_heif.register_heif_opener()
 
 
-def open_oriented(file_path: str) -> Image.Image:
+def open_oriented(file_path: str,
+                  draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
     """
     Open an image with its EXIF orientation already applied to the pixels.
 
@@ -24,8 +25,15 @@ def open_oriented(file_path: str) -> Image.Image:
 
     The returned image has no orientation tag left (exif_transpose strips it),
     so re-saving it cannot double-apply the rotation.
+
+    ``draft_size`` lets a caller that only wants a small image have libjpeg
+    decode at 1/2, 1/4 or 1/8 scale, never below that size. It must be set
+    before the pixels load, which is why it is done here rather than by the
+    caller. A no-op for formats other than JPEG.
     """
     img = Image.open(file_path)
+    if draft_size is not None:
+        img.draft(None, draft_size)
     oriented = ImageOps.exif_transpose(img) or img
     # exif_transpose returns a transposed *copy*, and Pillow's copies carry no
     # .format — restore it, or a caller that infers its save format from it
@@ -140,7 +148,10 @@ class ImageLoader:
 
         # Fallback to Pillow (handles HEIC and others QPixmap might miss)
         try:
-            with open_oriented(file_path) as img:
+            # Draft at twice max_size, as generate_thumbnail does, so a JPEG
+            # that ends up here skips most of its full-size decode.
+            draft_size = (max_size * 2, max_size * 2) if max_size else None
+            with open_oriented(file_path, draft_size=draft_size) as img:
                 # Resize with Pillow if requested (often higher quality/faster than Qt for large images)
                 if max_size:
                     width, height = img.size
@@ -1,14 +1,20 @@
 """Tests for the pure helpers in src/services/date_stamp_service.py.
 
 The actual glow/font rendering is image work and isn't unit-tested here; the
-deterministic string/number helpers are.
+deterministic string/number helpers are, along with the shortcuts that decide
+when rendering can be skipped.
 """
 
 from datetime import datetime
 
 import pytest
+import numpy as np
+from PIL import Image, ImageFilter
 
-from src.services.date_stamp_service import DateStampService, kelvin_to_rgb
+from src.services.date_stamp_service import (
+    DateStampService, _dilate, _kelvin_to_rgb_exact, clear_stamp_memo,
+    kelvin_to_rgb, kelvin_to_rgb_np,
+)
 
 
 class StubConfig:
@@ -16,6 +22,14 @@ class StubConfig:
         return default
 
 
+class DictConfig:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
 def service():
     return DateStampService(StubConfig())
 
@@ -39,6 +53,23 @@ class TestKelvinToRgb:
             for channel in kelvin_to_rgb(temp):
                 assert 0 <= channel <= 255
 
+    def test_table_matches_formula(self):
+        for temp in (1000, 1800, 6500, 6600, 12300, 40000):
+            assert kelvin_to_rgb(temp) == _kelvin_to_rgb_exact(temp)
+
+    def test_off_grid_temperatures_use_formula(self):
+        assert kelvin_to_rgb(1850) == _kelvin_to_rgb_exact(1850)
+
+
+class TestKelvinToRgbNp:
+    def test_matches_scalar_version_after_truncation(self):
+        temps = np.array([500, 1000, 1850, 1900, 2000, 6500, 6600, 6650, 12345, 99999])
+        vectorized = kelvin_to_rgb_np(temps).astype(int)
+        assert [tuple(rgb) for rgb in vectorized] == [kelvin_to_rgb(t) for t in temps]
+
+    def test_keeps_input_shape(self):
+        assert kelvin_to_rgb_np(np.full((4, 5), 3000)).shape == (4, 5, 3)
+
 
 class TestFormatDate:
     def test_yy_mm_dd(self):
@@ -61,6 +92,16 @@ class TestFormatDate:
         d = datetime(2023, 12, 25)
         assert svc._format_date(d, "YYYY.MM.DD") == "2023.12.25"
 
+    def test_literal_text_around_tokens_is_kept(self):
+        svc = service()
+        d = datetime(2023, 1, 5, 14, 30)
+        assert svc._format_date(d, "Taken DD/MM/YYYY") == "Taken 05/01/2023"
+
+    def test_literal_braces_are_kept(self):
+        svc = service()
+        d = datetime(2023, 1, 5)
+        assert svc._format_date(d, "{YY}") == "{23}"
+
 
 class TestParsePrintHeight:
     @pytest.mark.parametrize("tag,expected", [
@@ -81,3 +122,142 @@ class TestHexToRgb:
 
     def test_without_hash(self):
         assert DateStampService._hex_to_rgb("00ff00") == (0, 255, 0)
+
+
+class TestInvisibleStamp:
+    def test_sub_quantum_alpha_leaves_image_untouched(self):
+        # 1% glow x 1% opacity peaks at alpha 0.0001 -> 0 after 8-bit truncation
+        svc = DateStampService(DictConfig(date_stamp_glow_intensity=1,
+                                          date_stamp_opacity=1))
+        img = Image.new("RGB", (300, 200), (10, 120, 240))
+        out = svc.apply_date_stamp(img, datetime(2023, 12, 25), "9x6")
+        assert out.mode == "RGB"
+        assert out.tobytes() == img.tobytes()
+
+    def test_core_only_stamp_skips_the_glow(self):
+        # 1% glow x 50% opacity: the rim's alpha truncates to 0, the core's does not
+        svc = DateStampService(DictConfig(date_stamp_glow_intensity=1,
+                                          date_stamp_opacity=50))
+        tile, _ = svc._get_stamp((300, 200), "23.12.25", 40, 20)
+        left, top, right, bottom = svc._text_bbox("23.12.25", svc._load_font(40))
+        assert tile.size == (right - left, bottom - top)  # no room left for a halo
+        assert tile.getextrema()[3] == (0, 1)
+
+    def test_visible_stamp_brightens_its_corner(self):
+        svc = service()
+        img = Image.new("RGB", (300, 200), (0, 0, 0))
+        out = svc.apply_date_stamp(img, datetime(2023, 12, 25), "9x6")
+        assert out.size == img.size
+        # default position is bottom-right; the opposite corner is untouched
+        assert max(out.crop((150, 100, 300, 200)).getdata())[0] > 0
+        assert out.crop((0, 0, 50, 50)).getextrema() == ((0, 0),) * 3
+
+
+class TestInPlace:
+    def test_default_leaves_the_input_untouched(self):
+        img = Image.new("RGB", (300, 200))
+        out = service().apply_date_stamp(img, datetime(2023, 12, 25), "9x6")
+        assert out is not img
+        assert img.getextrema() == ((0, 0),) * 3
+
+    def test_in_place_stamps_an_rgb_input_directly(self):
+        img = Image.new("RGB", (300, 200))
+        out = service().apply_date_stamp(img, datetime(2023, 12, 25), "9x6",
+                                         in_place=True)
+        assert out is img
+        assert img.getextrema() != ((0, 0),) * 3
+
+    def test_in_place_still_converts_other_modes(self):
+        img = Image.new("L", (300, 200))
+        out = service().apply_date_stamp(img, datetime(2023, 12, 25), "9x6",
+                                         in_place=True)
+        assert out is not img and out.mode == "RGB"
+
+
+class TestScreenBlendRgb:
+    def test_alpha_base_is_stamped_as_opaque(self):
+        # apply_date_stamp only ever blends onto an opaque RGB base: an RGBA
+        # photo's alpha is dropped first, exactly as the JPEG export drops it.
+        rgba = Image.new("RGBA", (300, 200), (40, 80, 120, 100))
+        stamped = service().apply_date_stamp(rgba, datetime(2023, 12, 25), "9x6")
+        expected = service().apply_date_stamp(rgba.convert("RGB"),
+                                               datetime(2023, 12, 25), "9x6")
+        assert stamped.mode == "RGB"
+        assert stamped.tobytes() == expected.tobytes()
+
+    def blend(self, base_rgb, overlay_rgba):
+        base = Image.new("RGB", (2, 2), base_rgb)
+        overlay = Image.new("RGBA", (2, 2), overlay_rgba)
+        out = DateStampService._screen_blend_rgb(base, overlay)
+        assert out.mode == "RGB"
+        return out.getpixel((0, 0))
+
+    def test_transparent_overlay_keeps_base(self):
+        assert self.blend((12, 200, 77), (255, 255, 255, 0)) == (12, 200, 77)
+
+    def test_opaque_white_overlay_saturates(self):
+        assert self.blend((12, 200, 77), (255, 255, 255, 255)) == (255, 255, 255)
+
+    def test_screen_never_darkens(self):
+        r, g, b = self.blend((100, 100, 100), (128, 0, 255, 128))
+        assert r > 100 and g == 100 and b > 100
+
+
+class TestCalculateFontSize:
+    def test_snaps_to_even_sizes(self):
+        svc = service()  # 0.5 units tall on a 6-unit print: 1/12 of the height
+        assert svc._calculate_font_size("9x6", 612) == 52   # 51.0
+        assert svc._calculate_font_size("9x6", 606) == 50   # 50.5
+        assert svc._calculate_font_size("9x6", 630) == 52   # 52.5
+
+    def test_minimum_size(self):
+        assert service()._calculate_font_size("9x6", 60) == 12
+
+
+class TestRefreshSettings:
+    def test_settings_are_snapshotted_until_refreshed(self):
+        config = DictConfig(date_stamp_physical_height=0.5)
+        svc = DateStampService(config)
+        assert svc._calculate_font_size("9x6", 600) == 50
+
+        config.settings["date_stamp_physical_height"] = 1.0
+        assert svc._calculate_font_size("9x6", 600) == 50
+
+        svc.refresh_settings()
+        assert svc._calculate_font_size("9x6", 600) == 100
+
+
+class TestStampMemo:
+    def setup_method(self):
+        clear_stamp_memo()
+
+    def test_identical_stamp_is_rendered_once(self):
+        first = service()._get_stamp((300, 200), "23.12.25", 40, 20)
+        # a fresh service, as the image viewer builds per render
+        assert service()._get_stamp((300, 200), "23.12.25", 40, 20) is first
+
+    def test_changed_settings_render_afresh(self):
+        first = service()._get_stamp((300, 200), "23.12.25", 40, 20)
+        warmer = DateStampService(DictConfig(date_stamp_temp_core=3000))
+        assert warmer._get_stamp((300, 200), "23.12.25", 40, 20) is not first
+
+    def test_stamp_is_a_tile_inside_the_photo(self):
+        tile, (left, top) = service()._get_stamp((900, 600), "23.12.25", 40, 20)
+        assert 0 <= left and left + tile.width <= 900
+        assert 0 <= top and top + tile.height <= 600
+        assert tile.width * tile.height < 900 * 600 // 4
+
+
+class TestDilate:
+    @pytest.mark.parametrize("size", [3, 5, 9, 17])
+    def test_matches_pillow_max_filter(self, size):
+        rng = np.random.default_rng(size)
+        mask = rng.integers(0, 256, (37, 53), dtype=np.uint8)
+        mask[rng.random(mask.shape) < 0.8] = 0
+        expected = Image.fromarray(mask).filter(ImageFilter.MaxFilter(size))
+        assert np.array_equal(_dilate(mask, size), np.asarray(expected))
+
+
+class TestLoadFont:
+    def test_fonts_are_shared_between_services(self):
+        assert service()._load_font(40) is service()._load_font(40)
@@ -148,6 +148,15 @@ class TestOpenOriented:
 
         assert (result.getexif() or {}).get(274) in (None, 1)
 
+    def test_draft_decodes_smaller_but_still_upright(self, tmp_path):
+        stored = _asymmetric(400, 240)
+        path = _write_jpeg(tmp_path / "o6.jpg", stored, orientation=6)
+
+        result = np.asarray(open_oriented(path, draft_size=(100, 100)).convert("RGB"))
+
+        # 1/2 scale is the smallest that keeps both sides >= 100
+        assert_same_orientation(result, np.rot90(stored, -1)[::2, ::2])
+
 
 class TestGetImageDimensions:
     def test_axes_swap_for_quarter_turns(self, tmp_path):
@@ -276,6 +285,33 @@ class TestRotatePreservesMetadata:
         assert_same_orientation(result, np.rot90(stored, -1))
 
 
+class TestRotateKeepsCompression:
+    """Rotating re-encodes with the photo's own tables, not a fixed quality."""
+
+    def test_quantization_tables_are_reused(self, tmp_path):
+        from src.services.image_processor import ImageProcessor
+
+        path = str(tmp_path / "q50.jpg")
+        Image.fromarray(_asymmetric(64, 48)).save(path, "JPEG", quality=50)
+        before = Image.open(path).quantization
+
+        assert ImageProcessor.rotate_image(path, degrees=-90)
+
+        assert Image.open(path).quantization == before
+
+    def test_full_turn_leaves_the_file_alone(self, tmp_path):
+        from src.services.image_processor import ImageProcessor
+
+        path = _write_jpeg(tmp_path / "o1.jpg", _asymmetric(60, 40))
+        with open(path, "rb") as f:
+            before = f.read()
+
+        assert ImageProcessor.rotate_image(path, degrees=360)
+
+        with open(path, "rb") as f:
+            assert f.read() == before
+
+
 class TestCropExportRespectsOrientation:
     """The export path is where a missed rotation becomes permanent.
 
@@ -9,11 +9,12 @@ import os
 from datetime import datetime
 
 import piexif
+import pytest
 from PIL import Image
 
 from src.models.image_item import ImageItem
 from src.models.project import Project
-from src.services.image_processor import ImageProcessor
+from src.services.image_processor import ImageProcessor, _parse_exif_datetime
 
 
 def write_jpeg_with_date(path, date_str="2023:12:25 14:30:22"):
@@ -36,6 +37,43 @@ class TestReadExifDate:
         # falls back to file modification time → still a datetime, never None
         assert isinstance(result, datetime)
 
+    def test_reads_datetime_original_without_piexif(self, tmp_path, monkeypatch):
+        p = tmp_path / "photo.jpg"
+        write_jpeg_with_date(p)
+
+        def fail(path):
+            raise AssertionError("Pillow already had the date")
+        monkeypatch.setattr(piexif, "load", fail)
+
+        assert ImageProcessor.read_exif_date(str(p)) == datetime(2023, 12, 25, 14, 30, 22)
+
+    def test_no_date_is_not_read_twice(self, tmp_path, monkeypatch):
+        p = tmp_path / "screenshot.png"
+        Image.new("RGB", (16, 16)).save(str(p), "PNG")
+
+        calls = []
+        monkeypatch.setattr(piexif, "load", calls.append)
+
+        assert ImageProcessor.read_exif_date(str(p)) == datetime.fromtimestamp(
+            os.path.getmtime(p))
+        assert calls == []
+
+
+class TestParseExifDatetime:
+    def test_fixed_layout(self):
+        assert _parse_exif_datetime("2023:12:25 14:30:22") == datetime(2023, 12, 25, 14, 30, 22)
+
+    def test_piexif_bytes_and_nul_terminator(self):
+        expected = datetime(2023, 12, 25, 14, 30, 22)
+        assert _parse_exif_datetime(b"2023:12:25 14:30:22") == expected
+        assert _parse_exif_datetime("2023:12:25 14:30:22\x00") == expected
+
+    def test_invalid_date_still_raises(self):
+        with pytest.raises(ValueError):
+            _parse_exif_datetime("2023:13:25 14:30:22")
+        with pytest.raises(ValueError):
+            _parse_exif_datetime("    :  :     :  :  ")
+
 
 class TestGetExifInfo:
     def test_returns_core_fields(self, tmp_path):
@@ -48,6 +86,29 @@ class TestGetExifInfo:
         assert "Size" in info and info["Size"].endswith("MB")
         assert "Date Modified" in info
 
+    def test_details_come_from_a_single_read(self, tmp_path, monkeypatch):
+        p = tmp_path / "photo.jpg"
+        exif_bytes = piexif.dump({
+            "0th": {piexif.ImageIFD.Make: b"Cam"},
+            "Exif": {piexif.ExifIFD.ISOSpeedRatings: 200,
+                     piexif.ExifIFD.DateTimeOriginal: b"2023:12:25 14:30:22"},
+        })
+        Image.new("RGB", (16, 16)).save(str(p), "JPEG", exif=exif_bytes)
+        real_load = piexif.load
+        loaded_from = []
+
+        def load(data):
+            loaded_from.append(data)
+            return real_load(data)
+        monkeypatch.setattr(piexif, "load", load)
+
+        info = ImageProcessor.get_exif_info(str(p))
+
+        assert info["Camera Make"] == "Cam"
+        assert info["ISO"] == "200"
+        assert info["Date Taken"] == "2023:12:25 14:30:22"
+        assert all(isinstance(data, bytes) for data in loaded_from)
+
 
 class TestRenameByDate:
     def test_renames_using_date_taken(self, tmp_path):
@@ -96,3 +157,18 @@ class TestRenameByDate:
 
         assert ImageProcessor.rename_by_date(project) == 0
         assert src.exists()  # untouched
+
+    def test_reads_missing_dates_from_exif_in_project_order(self, tmp_path):
+        items = []
+        for i, date_str in enumerate(["2023:12:25 14:30:22", "2021:01:02 03:04:05",
+                                      "2023:12:25 14:30:22"]):
+            src = tmp_path / f"orig_{i}.jpg"
+            write_jpeg_with_date(src, date_str)
+            items.append(ImageItem(str(src)))
+        project = Project("p", str(tmp_path), str(tmp_path / "out"))
+        project.images = items
+
+        assert ImageProcessor.rename_by_date(project) == 3
+        assert [os.path.basename(i.file_path) for i in items] == [
+            "20231225_143022.jpg", "20210102_030405.jpg", "20231225_143022_1.jpg",
+        ]
@@ -0,0 +1,398 @@
+"""Tests for src/services/image_similarity_service.py, short of the model.
+
+Feature extraction needs torch and a downloaded ResNet50, so it is out of
+scope; the service is built without its model and handed feature vectors
+directly, which is all ranking and the feature cache look at.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.models.image_item import ImageItem
+from src.services import image_similarity_service
+from src.services.image_similarity_service import (
+    CACHE_FEATURES_FILE,
+    LEGACY_CACHE_FILE_NAME,
+    LEGACY_MATRIX_FILE,
+    LEGACY_PATHS_FILE,
+    FeatureMatrix,
+    ImageSimilarityService,
+    _normalize_rows,
+)
+
+
+def make_service():
+    """The service minus its model: ranking never touches it."""
+    svc = ImageSimilarityService.__new__(ImageSimilarityService)
+    svc._directory_features = {}
+    return svc
+
+
+def item(path, features):
+    it = ImageItem(path)
+    it.feature_vector = np.asarray(features, dtype=np.float32)
+    return it
+
+
+class TestFindSimilarImages:
+    def test_ranks_by_cosine_similarity(self):
+        svc = make_service()
+        target = item("/t.jpg", [1, 0, 0])
+        near = item("/near.jpg", [0.9, 0.1, 0])
+        far = item("/far.jpg", [0, 1, 0])
+        opposite = item("/opposite.jpg", [-1, 0, 0])
+
+        results = svc.find_similar_images(target, [far, opposite, near],
+                                          top_k=10, min_similarity=0.0)
+
+        assert [r[0] for r in results] == [near, far, opposite]
+        for candidate, score in results:
+            expected = svc.compute_similarity(target.feature_vector,
+                                              candidate.feature_vector)
+            assert score == pytest.approx(expected, abs=1e-6)
+
+    def test_skips_target_and_applies_threshold_and_top_k(self):
+        svc = make_service()
+        target = item("/t.jpg", [1, 0])
+        candidates = [target] + [item(f"/{i}.jpg", [1, i * 0.1]) for i in range(5)]
+        candidates.append(item("/below.jpg", [-1, 0]))
+
+        results = svc.find_similar_images(target, candidates, top_k=3,
+                                          min_similarity=0.5)
+
+        assert [r[0].file_path for r in results] == ["/0.jpg", "/1.jpg", "/2.jpg"]
+
+    def test_top_k_of_many_matches_a_full_sort_with_ties_in_order(self):
+        svc = make_service()
+        target = item("/t.jpg", [1, 0])
+        rng = np.random.default_rng(1)
+        # Few distinct directions, so many candidates tie
+        angles = rng.integers(0, 12, 300) * (np.pi / 24)
+        candidates = [item(f"/{i}.jpg", [np.cos(a), np.sin(a)]) for i, a in enumerate(angles)]
+
+        results = svc.find_similar_images(target, candidates, top_k=25, min_similarity=0.0)
+
+        scored = [(c, svc.compute_similarity(target.feature_vector, c.feature_vector))
+                  for c in candidates]
+        expected = sorted(scored, key=lambda pair: -round(pair[1], 5))[:25]
+        assert [r[0] for r in results] == [c for c, _ in expected]
+
+    def test_exact_search_scores_the_matrix_in_place(self, monkeypatch):
+        svc = make_service()
+        features = FeatureMatrix(["/t.jpg", "/a.jpg"], [np.array([1, 0], np.float32),
+                                                        np.array([1, 0.2], np.float32)])
+        seen = []
+        real_scores = FeatureMatrix.scores
+        monkeypatch.setattr(FeatureMatrix, "scores",
+                            lambda self, target, rows=None: seen.append(rows)
+                            or real_scores(self, target, rows))
+
+        results = svc.find_similar_in_matrix(item("/t.jpg", [1, 0]), features,
+                                             min_similarity=0.0)
+
+        assert seen == [None]
+        assert [r[0].file_path for r in results] == ["/a.jpg"]
+
+    def test_zero_vector_scores_zero(self):
+        svc = make_service()
+        target = item("/t.jpg", [1, 0])
+        blank = item("/blank.jpg", [0, 0])
+
+        assert svc.find_similar_images(target, [blank], min_similarity=0.0) == [
+            (blank, 0.0)]
+
+
+class TestNormalizeRows:
+    def test_unit_rows_in_place_and_zero_row_kept(self):
+        matrix = np.array([[3, 4], [0, 0]], np.float32)
+
+        norms = _normalize_rows(matrix)
+
+        np.testing.assert_allclose(matrix, [[0.6, 0.8], [0, 0]])
+        np.testing.assert_allclose(norms, [5, 0])
+
+
+class TestFeatureMatrix:
+    def test_rows_are_normalized_and_contiguous(self):
+        fm = FeatureMatrix(["/a.jpg", "/b.jpg"],
+                           [np.array([3, 4], np.float32), np.array([0, 2], np.float32)])
+
+        assert fm.matrix.dtype == np.float32
+        assert fm.matrix.flags.c_contiguous
+        np.testing.assert_allclose(np.linalg.norm(fm.matrix, axis=1), 1.0, rtol=1e-6)
+
+    def test_scores_match_compute_similarity(self):
+        svc = make_service()
+        vectors = [np.array(v, np.float32) for v in ([1, 2, 3], [-3, 0, 1], [0, 0, 0])]
+        target = np.array([2, -1, 0.5], np.float32)
+        fm = FeatureMatrix(["/a", "/b", "/c"], vectors)
+
+        np.testing.assert_allclose(
+            fm.scores(target),
+            [svc.compute_similarity(target, v) for v in vectors], atol=1e-6)
+
+    def test_scores_subset_of_rows(self):
+        vectors = [np.array(v, np.float32) for v in ([1, 0], [0, 1], [-1, 0])]
+        fm = FeatureMatrix(["/a", "/b", "/c"], vectors)
+        target = np.array([1, 1], np.float32)
+
+        np.testing.assert_allclose(fm.scores(target, np.array([2, 0])),
+                                   fm.scores(target)[[2, 0]])
+
+    def test_small_matrix_is_scanned_exactly(self):
+        fm = FeatureMatrix(["/a", "/b"], [np.ones(2, np.float32)] * 2)
+
+        assert fm.nearest_rows(np.ones(2, np.float32), 1) is None
+
+    def test_large_matrix_nearest_rows_with_faiss(self, monkeypatch):
+        pytest.importorskip("faiss")
+        monkeypatch.setattr("src.services.image_similarity_service.ANN_MIN_ROWS", 10)
+        rng = np.random.default_rng(0)
+        vectors = list(rng.standard_normal((200, 16)).astype(np.float32))
+        fm = FeatureMatrix([f"/{i}" for i in range(200)], vectors)
+
+        rows = fm.nearest_rows(vectors[7], 5)
+
+        assert 7 in rows
+        assert list(rows) == sorted(rows)
+
+    def test_empty(self):
+        fm = FeatureMatrix([], [])
+
+        assert len(fm) == 0
+        assert fm.scores(np.ones(3, np.float32)).shape == (0,)
+
+
+class TestDirectoryFeatures:
+    def test_cached_directory_is_searched_in_place(self, tmp_path):
+        svc = make_service()
+        paths = [str(tmp_path / name) for name in ("near.jpg", "far.jpg", "notes.txt")]
+        for path in paths:
+            open(path, "wb").close()
+        svc._save_cache_to_disk(str(tmp_path), {
+            paths[0]: np.array([1, 0.1], np.float32),
+            paths[1]: np.array([0, 1], np.float32),
+        })
+
+        images = svc.load_images_from_directory(str(tmp_path), [".jpg"])
+        features = svc.get_directory_features(str(tmp_path))
+
+        assert len(images) == 2
+        assert sorted(features.paths) == sorted(paths[:2])
+
+        results = svc.find_similar_in_matrix(item("/t.jpg", [1, 0]), features,
+                                             min_similarity=0.0)
+        assert [r[0].file_path for r in results] == paths[:2]
+        assert results[0][1] > results[1][1]
+
+    def test_lists_only_files_with_supported_extensions(self, tmp_path):
+        svc = make_service()
+        (tmp_path / "dir.jpg").mkdir()
+        for name in ("a.JPG", "b.png", "c.txt"):
+            open(tmp_path / name, "wb").close()
+        svc._save_cache_to_disk(str(tmp_path), {
+            str(tmp_path / name): np.ones(2, np.float32) for name in ("a.JPG", "b.png")})
+
+        images = svc.load_images_from_directory(str(tmp_path), [".jpg", ".PNG"])
+
+        assert sorted(os.path.basename(img["path"]) for img in images) == ["a.JPG", "b.png"]
+
+    def test_matrix_reused_while_paths_are_unchanged(self, tmp_path):
+        svc = make_service()
+        path = str(tmp_path / "a.jpg")
+        open(path, "wb").close()
+        svc._save_cache_to_disk(str(tmp_path), {path: np.array([1, 0], np.float32)})
+
+        svc.load_images_from_directory(str(tmp_path), [".jpg"])
+        first = svc.get_directory_features(str(tmp_path))
+        svc.load_images_from_directory(str(tmp_path), [".jpg"])
+
+        assert svc.get_directory_features(str(tmp_path)) is first
+
+    def test_interrupted_scan_keeps_checkpointed_features(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_similarity_service, "CACHE_CHECKPOINT_IMAGES", 2)
+        svc = make_service()
+        paths = [str(tmp_path / f"{i}.jpg") for i in range(5)]
+        for path in paths:
+            open(path, "wb").close()
+        calls = []
+
+        def extract(chunk, progress_callback=None):
+            calls.append(list(chunk))
+            if len(calls) == 3:
+                raise RuntimeError("scan aborted")
+            return [np.array([1, i], np.float32) for i in range(len(chunk))]
+
+        svc.extract_features_batch = extract
+
+        with pytest.raises(RuntimeError):
+            svc.load_images_from_directory(str(tmp_path), [".jpg"])
+
+        assert [len(chunk) for chunk in calls] == [2, 2, 1]
+        assert len(svc._load_cache_from_disk(str(tmp_path))) == 4
+
+
+class TestFeatureCacheFile:
+    def test_round_trip_is_float16_and_keeps_direction(self, tmp_path):
+        svc = make_service()
+        vectors = {"/a.jpg": np.array([3, 4, 0], np.float32),
+                   "/b.jpg": np.array([0.001, 250, 7], np.float32),
+                   "/zero.jpg": np.zeros(3, np.float32)}
+
+        svc._save_cache_to_disk(str(tmp_path), vectors)
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+
+        assert set(loaded) == set(vectors)
+        for path, vector in vectors.items():
+            assert loaded[path].dtype == np.float16
+            assert svc.compute_similarity(loaded[path], vector) == pytest.approx(
+                svc.compute_similarity(vector, vector), abs=1e-3)
+
+    def test_loads_memory_mapped(self, tmp_path):
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {"/a.jpg": np.array([1, 0], np.float32)})
+
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+
+        assert isinstance(loaded["/a.jpg"], np.memmap)
+
+    def test_resave_while_mapped_keeps_old_rows_readable(self, tmp_path):
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {"/a.jpg": np.array([1, 0], np.float32)})
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+
+        loaded["/b.jpg"] = np.array([0, 1], np.float32)
+        svc._save_cache_to_disk(str(tmp_path), loaded)
+
+        np.testing.assert_array_equal(loaded["/a.jpg"], [1, 0])
+        assert set(svc._load_cache_from_disk(str(tmp_path))) == {"/a.jpg", "/b.jpg"}
+
+    def test_new_images_are_appended_not_rewritten(self, tmp_path):
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {"/a.jpg": np.array([1, 0], np.float32)})
+        features_path = svc._get_cache_path(str(tmp_path), CACHE_FEATURES_FILE)
+        inode = os.stat(features_path).st_ino
+        with open(features_path, "rb") as f:
+            first_row = f.read()
+
+        cache = svc._load_cache_from_disk(str(tmp_path))
+        cache["/b.jpg"] = np.array([0, 3], np.float32)
+        svc._save_cache_to_disk(str(tmp_path), cache)
+
+        assert os.stat(features_path).st_ino == inode
+        with open(features_path, "rb") as f:
+            assert f.read(len(first_row)) == first_row
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+        assert list(loaded) == ["/a.jpg", "/b.jpg"]
+        np.testing.assert_array_equal(loaded["/b.jpg"], [0, 1])
+
+    def test_concurrent_saves_never_mix_up_rows(self, tmp_path, monkeypatch):
+        import threading
+        import time
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {"/a.jpg": np.array([1, 0], np.float32)})
+        real_rows = ImageSimilarityService._cache_rows
+        real_dump = image_similarity_service.json.dump
+
+        # Unlocked, these delays would have /b.jpg's saver write its row first
+        # and its index last, after /c.jpg's row had overwritten it
+        def slow_rows(cache, paths):
+            time.sleep(0.05 if "/b.jpg" in cache else 0.1)
+            return real_rows(cache, paths)
+
+        def slow_dump(data, f, **kwargs):
+            if "/b.jpg" in data.get("paths", []):
+                time.sleep(0.15)
+            return real_dump(data, f, **kwargs)
+        monkeypatch.setattr(ImageSimilarityService, "_cache_rows", staticmethod(slow_rows))
+        monkeypatch.setattr(image_similarity_service.json, "dump", slow_dump)
+
+        vectors = {"/b.jpg": [0, 1], "/c.jpg": [-1, 0]}
+        threads = [threading.Thread(target=svc._save_cache_to_disk, args=(str(tmp_path), {
+            "/a.jpg": np.array([1, 0], np.float32), path: np.array(v, np.float32)}))
+            for path, v in vectors.items()]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+        expected = {"/a.jpg": [1, 0], **vectors}
+        for path, vector in loaded.items():
+            np.testing.assert_array_equal(vector, expected[path])
+
+    def test_dropped_entries_rewrite_the_cache(self, tmp_path):
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {
+            "/a.jpg": np.array([1, 0], np.float32), "/b.jpg": np.array([0, 1], np.float32)})
+
+        svc._save_cache_to_disk(str(tmp_path), {"/b.jpg": np.array([0, 1], np.float32)})
+
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+        assert list(loaded) == ["/b.jpg"]
+        np.testing.assert_array_equal(loaded["/b.jpg"], [0, 1])
+
+    def test_rewrite_releases_mapped_rows_first(self, tmp_path):
+        svc = make_service()
+        svc._save_cache_to_disk(str(tmp_path), {
+            "/a.jpg": np.array([1, 0], np.float32), "/b.jpg": np.array([0, 1], np.float32)})
+        cache = svc._load_cache_from_disk(str(tmp_path))
+        assert isinstance(cache["/b.jpg"], np.memmap)
+
+        del cache["/a.jpg"]
+        svc._save_cache_to_disk(str(tmp_path), cache)
+
+        # nothing left mapping the replaced file (Windows can't replace it otherwise)
+        assert not any(isinstance(v, np.memmap) for v in cache.values())
+        np.testing.assert_array_equal(cache["/b.jpg"], [0, 1])
+        assert list(svc._load_cache_from_disk(str(tmp_path))) == ["/b.jpg"]
+
+    def test_failed_save_is_reported(self, tmp_path, capsys):
+        svc = make_service()
+        open(tmp_path / ".cache", "w").close()  # a file where the folder should be
+
+        svc._save_cache_to_disk(str(tmp_path), {"/a.jpg": np.array([1, 0], np.float32)})
+
+        assert "Error saving feature cache" in capsys.readouterr().out
+
+    def test_reads_older_npy_matrix(self, tmp_path):
+        svc = make_service()
+        matrix_path = svc._get_cache_path(str(tmp_path), LEGACY_MATRIX_FILE)
+        os.makedirs(os.path.dirname(matrix_path))
+        np.save(matrix_path, np.array([[0.6, 0.8]], np.float16))
+        with open(svc._get_cache_path(str(tmp_path), LEGACY_PATHS_FILE), "w") as f:
+            f.write('["/a.jpg"]')
+
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+
+        np.testing.assert_allclose(loaded["/a.jpg"], [0.6, 0.8], atol=1e-3)
+
+    def test_reads_older_per_path_archives(self, tmp_path):
+        svc = make_service()
+        cache_path = svc._get_cache_path(str(tmp_path), LEGACY_CACHE_FILE_NAME)
+        os.makedirs(os.path.dirname(cache_path))
+        np.savez_compressed(cache_path, **{"/a.jpg": np.array([1, 2], np.float32)})
+
+        loaded = svc._load_cache_from_disk(str(tmp_path))
+
+        np.testing.assert_array_equal(loaded["/a.jpg"], [1, 2])
+
+    def test_saving_replaces_older_archive(self, tmp_path):
+        svc = make_service()
+        cache_path = svc._get_cache_path(str(tmp_path), LEGACY_CACHE_FILE_NAME)
+        os.makedirs(os.path.dirname(cache_path))
+        np.savez_compressed(cache_path, **{"/a.jpg": np.array([1, 2], np.float32)})
+
+        svc._save_cache_to_disk(str(tmp_path), svc._load_cache_from_disk(str(tmp_path)))
+
+        assert not os.path.exists(cache_path)
+        assert set(svc._load_cache_from_disk(str(tmp_path))) == {"/a.jpg"}
+
+    def test_empty_cache(self, tmp_path):
+        svc = make_service()
+
+        svc._save_cache_to_disk(str(tmp_path), {})
+
+        assert svc._load_cache_from_disk(str(tmp_path)) == {}
@@ -0,0 +1,110 @@
+"""Regression tests for the 'Archive' handler's progress dialog and guard.
+
+Archiving deletes the project's folders and can't be stopped half-way, but its
+progress dialog used to close on Escape, leaving the archive running unseen
+while the Archive button stayed live for a second, overlapping run.
+
+Like the pull tests, these bypass ``MainWindow.__init__`` and build only what
+``on_archive_requested`` touches.
+"""
+
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox
+
+from src.ui.main_window import BlockingProgressDialog, MainWindow
+from src.ui.widgets.toolbar_top import ProjectToolbar
+
+
+class FakeConfig:
+    def get_setting(self, key, default=None):
+        return default
+
+
+class SlowProjectManager:
+    """Archives nothing, but only once ``release`` is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.archived = []
+
+    def archive_project(self, name, workspace_dir=None, progress_callback=None):
+        self.release.wait(5)
+        self.archived.append(name)
+        return {"thumbnails_created": 0, "zip_created": True,
+                "folders_deleted": True, "project_removed": True}
+
+
+@pytest.fixture
+def window(qapp, monkeypatch):
+    """A MainWindow with a live Qt object but none of its heavy __init__."""
+    w = MainWindow.__new__(MainWindow)
+    QMainWindow.__init__(w)
+    w.project_toolbar = ProjectToolbar()
+    w.config = FakeConfig()
+    w.project_manager = SlowProjectManager()
+    w.current_project = None
+    w._archive_worker = None
+    monkeypatch.setattr(w, "load_projects", lambda: None)
+    monkeypatch.setattr(QMessageBox, "question",
+                        lambda *a, **k: QMessageBox.StandardButton.Yes)
+    monkeypatch.setattr(QMessageBox, "information", lambda *a, **k: None)
+    yield w
+    w.project_manager.release.set()
+    if w._archive_worker is not None:
+        w._archive_worker.wait()
+    w.deleteLater()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+class TestBlockingProgressDialog:
+    def test_escape_and_close_are_ignored_until_finished(self, qapp):
+        dialog = BlockingProgressDialog("Working...")
+        dialog.show()
+
+        QTest.keyClick(dialog, Qt.Key.Key_Escape)
+        dialog.close()
+        qapp.processEvents()
+        assert dialog.isVisible()
+
+        dialog.finish()
+        qapp.processEvents()
+        assert not dialog.isVisible()
+
+
+class TestArchiveRequested:
+    def test_archive_button_is_disabled_until_the_archive_ends(self, window):
+        window.on_archive_requested("trip")
+
+        assert window._archive_worker is not None
+        assert not window.project_toolbar.archive_project_btn.isEnabled()
+
+        window.project_manager.release.set()
+        assert wait_until(lambda: window._archive_worker is None)
+        assert window.project_toolbar.archive_project_btn.isEnabled()
+        assert window.project_manager.archived == ["trip"]
+
+    def test_second_request_while_archiving_is_ignored(self, window,
+                                                       monkeypatch):
+        window.on_archive_requested("trip")
+        asked = []
+        monkeypatch.setattr(QMessageBox, "question",
+                            lambda *a, **k: asked.append(a))
+
+        window.on_archive_requested("other")
+
+        assert asked == []
+        window.project_manager.release.set()
+        assert wait_until(lambda: window._archive_worker is None)
+        assert window.project_manager.archived == ["trip"]
@@ -6,6 +6,8 @@ Qt is only imported, never driven — no QApplication or pixmaps are created.
 import os
 from datetime import datetime
 
+import numpy as np
+
 from src.models.image_item import ImageItem
 from src.models.project import Project
 
@@ -123,6 +125,15 @@ class TestImageItemSerialization:
         assert item.add_date_stamp is False
         assert item.date_taken is None
 
+    def test_feature_vector_restores_as_float32(self):
+        item = ImageItem("/x/a.jpg")
+        item.feature_vector = np.array([0.6, 0.8], dtype=np.float32)
+
+        restored = ImageItem.from_dict(item.to_dict())
+
+        assert restored.feature_vector.dtype == np.float32
+        np.testing.assert_array_equal(restored.feature_vector, item.feature_vector)
+
 
 class TestGetDisplayDate:
     def test_parses_date_from_filename(self):
@@ -161,6 +172,19 @@ class TestProject:
         names = sorted(os.path.basename(i.file_path) for i in proj.images)
         assert names == ["a.jpg", "b.png"]
 
+    def test_load_images_sorted_and_skips_directories(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "folder.jpg").mkdir()
+        for name in ("c.JPG", "a.jpg", "b.png"):
+            (input_dir / name).write_bytes(b"")
+
+        proj = Project("p", str(input_dir), str(tmp_path / "output"))
+        proj.load_images([".jpg", ".PNG"])
+
+        names = [os.path.basename(i.file_path) for i in proj.images]
+        assert names == ["a.jpg", "b.png", "c.JPG"]
+
     def test_tagged_untagged_partitioning(self):
         proj = Project("p", "/in", "/out")
         a, b, c = ImageItem("/in/a.jpg"), ImageItem("/in/b.jpg"), ImageItem("/in/c.jpg")
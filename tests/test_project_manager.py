@@ -1,5 +1,6 @@
 """Tests for src/services/project_manager.py — CRUD, discovery, imports."""
 
+import json
 import os
 
 from src.services.project_manager import ProjectManager
@@ -49,6 +50,71 @@ class TestCrud:
         assert isinstance(loaded, list)
         assert pm2.get_project_names() == ["2026-06"]
 
+    def test_lookup_by_name_follows_create_load_and_delete(self, tmp_path):
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        created = pm.create_project("a", ws)
+        assert pm.get_project_by_name("a") is created
+
+        pm.load_projects()
+        loaded = pm.get_project_by_name("a")
+        assert loaded is not created and loaded in pm.projects
+
+        pm.delete_project("a")
+        assert pm.get_project_by_name("a") is None
+
+    def test_unchanged_file_is_not_parsed_again(self, tmp_path, monkeypatch):
+        ws = workspace(tmp_path)
+        ProjectManager(workspace_directory=ws).create_project("kept", ws)
+        pm = ProjectManager(workspace_directory=ws)
+        first = pm.load_projects()[0]
+        other = ProjectManager(workspace_directory=ws)
+        other.load_projects()
+
+        parses = []
+        real_load = json.load
+        monkeypatch.setattr("src.services.project_manager.json.load",
+                            lambda f: parses.append(f) or real_load(f))
+        assert pm.load_projects()[0] is first
+        assert parses == []
+
+        # changed on disk (e.g. by another instance): parsed again
+        other.create_project("added", ws)
+        assert pm.get_project_names() == ["kept"]
+        pm.load_projects()
+        assert len(parses) == 1
+        assert pm.get_project_names() == ["kept", "added"]
+
+    def test_save_recreates_a_removed_data_dir(self, tmp_path):
+        import shutil
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        pm.create_project("a", ws)
+        shutil.rmtree(pm.data_dir)
+
+        pm.create_project("b", ws)
+
+        # Written by the same save, not left for the next one
+        with open(pm.projects_file) as f:
+            saved = [p["name"] for p in json.load(f)["projects"]]
+        assert saved == ["a", "b"]
+
+    def test_failed_save_keeps_previous_file(self, tmp_path, monkeypatch):
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        pm.create_project("kept", ws)
+        with open(pm.projects_file) as f:
+            before = f.read()
+
+        def fail(data, f, **kwargs):
+            f.write('{"projects": [')
+            raise OSError("disk full")
+        monkeypatch.setattr("src.services.project_manager.json.dump", fail)
+        pm.create_project("lost", ws)
+
+        with open(pm.projects_file) as f:
+            assert f.read() == before
+
 
 class TestDiscovery:
     def test_discovers_dropped_project_folder(self, tmp_path):
@@ -81,6 +147,74 @@ class TestDiscovery:
         assert pm.get_project_names() == []
 
 
+    def test_bad_entry_skips_only_itself_and_file_is_kept(self, tmp_path):
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        os.makedirs(pm.data_dir)
+        with open(pm.projects_file, "w") as f:
+            json.dump({"projects": [
+                {"name": "elsewhere", "input_folder": "/other/in", "output_folder": "/other/out"},
+                {"input_folder": "/broken/in"},
+                {"name": "later", "input_folder": "/later/in", "output_folder": "/later/out"},
+            ]}, f)
+        with open(pm.projects_file) as f:
+            before = f.read()
+        os.makedirs(os.path.join(ws, "dropped", "input"))
+
+        pm.load_projects()
+
+        assert pm.get_project_names() == ["elsewhere", "later", "dropped"]
+        # discovery must not save over the entry that couldn't be read
+        with open(pm.projects_file) as f:
+            assert f.read() == before
+
+
+class TestClearDeletedSizes:
+    def test_clears_tags_and_saves_each_file_once(self, tmp_path, monkeypatch):
+        from src.models.image_item import ImageItem
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        items = {}
+        for name, album, size in (("a", "A4", "9x6"), ("b", "A5", "4x6"), ("c", "A5", "5x5")):
+            item = ImageItem(f"/in/{name}.jpg")
+            item.set_tags(album=album, size=size)
+            items[name] = item
+            pm.create_project(name, ws).images = [item]
+        untouched = pm.create_project("d", ws)
+        untouched.images = [ImageItem("/in/d.jpg")]
+
+        saves = []
+        monkeypatch.setattr(pm, "save_projects", lambda: saves.append("projects.json"))
+        for project in pm.projects:
+            monkeypatch.setattr(project, "save_project_data",
+                                lambda data_dir, name=project.name: saves.append(name))
+
+        pm.clear_tags_for_deleted_sizes({"4x6"}, {"A4"})
+
+        assert (items["a"].album_tag, items["a"].size_tag) == (None, None)
+        assert (items["b"].album_tag, items["b"].size_tag) == ("A5", None)
+        assert (items["c"].album_tag, items["c"].size_tag) == ("A5", "5x5")
+        assert saves == ["a", "b", "projects.json"]
+
+    def test_nothing_cleared_saves_nothing(self, tmp_path, monkeypatch):
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        pm.create_project("p", ws)
+        saves = []
+        monkeypatch.setattr(pm, "save_projects", lambda: saves.append("projects.json"))
+
+        pm.clear_tags_for_deleted_sizes({"4x6"}, {"A4"})
+
+        assert saves == []
+
+    def test_nothing_deleted_skips_the_scan(self, tmp_path):
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        pm.create_project("p", ws).images = None  # would fail if iterated
+
+        pm.clear_tags_for_deleted_sizes(set(), set())
+
+
 class TestImportPrinted:
     def test_import_creates_thumbnails(self, tmp_path):
         ws = workspace(tmp_path)
@@ -114,3 +248,92 @@ class TestImportPrinted:
         assert stats["imported"] == 2
         printed = os.path.join(ws, "_past_printed")
         assert set(os.listdir(printed)) == {"pic.jpg", "pic_1.jpg"}
+
+
+class TestArchive:
+    def test_archives_nested_output(self, tmp_path):
+        import zipfile
+        from PIL import Image
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        proj = pm.create_project("2026-05", ws)
+        os.makedirs(os.path.join(proj.output_folder, "A4", "9x6"))
+        Image.new("RGB", (300, 200), (10, 20, 30)).save(
+            os.path.join(proj.output_folder, "top.JPG"))
+        Image.new("RGB", (200, 300), (40, 50, 60)).save(
+            os.path.join(proj.output_folder, "A4", "9x6", "deep.png"))
+        with open(os.path.join(proj.output_folder, "A4", "notes.txt"), "w") as f:
+            f.write("not an image")
+
+        stats = pm.archive_project("2026-05", workspace_dir=ws, thumbnail_size=64)
+
+        assert stats == {'thumbnails_created': 2, 'zip_created': True,
+                         'folders_deleted': True, 'project_removed': True}
+        printed = os.path.join(ws, "_past_printed")
+        assert set(os.listdir(printed)) == {"top.jpg", "deep.jpg"}
+        with zipfile.ZipFile(os.path.join(ws, "2026-05_output.zip")) as zf:
+            assert sorted(zf.namelist()) == [
+                "output/A4/9x6/deep.png", "output/A4/notes.txt", "output/top.JPG"]
+            # images are stored as they are, anything else is deflated
+            assert {info.filename: info.compress_type for info in zf.infolist()} == {
+                "output/A4/9x6/deep.png": zipfile.ZIP_STORED,
+                "output/A4/notes.txt": zipfile.ZIP_DEFLATED,
+                "output/top.JPG": zipfile.ZIP_STORED,
+            }
+        assert not os.path.exists(os.path.join(ws, "2026-05"))
+        assert pm.get_project_names() == []
+
+    def test_reports_progress_per_phase(self, tmp_path):
+        from PIL import Image
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        proj = pm.create_project("p", ws)
+        for name in ("a.jpg", "b.jpg"):
+            Image.new("RGB", (20, 20)).save(os.path.join(proj.output_folder, name))
+        with open(os.path.join(proj.output_folder, "notes.txt"), "w") as f:
+            f.write("x")
+        calls = []
+
+        pm.archive_project("p", workspace_dir=ws,
+                           progress_callback=lambda *args: calls.append(args))
+
+        assert calls == [(1, 2, "Creating thumbnails"), (2, 2, "Creating thumbnails"),
+                         (1, 3, "Zipping output"), (2, 3, "Zipping output"),
+                         (3, 3, "Zipping output")]
+
+    def test_thumbnail_name_clash_keeps_the_last_source(self, tmp_path):
+        from PIL import Image
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        proj = pm.create_project("clash", ws)
+        os.makedirs(os.path.join(proj.output_folder, "A4"))
+        Image.new("RGB", (50, 50), (255, 0, 0)).save(os.path.join(proj.output_folder, "pic.jpg"))
+        Image.new("RGB", (50, 50), (0, 0, 255)).save(os.path.join(proj.output_folder, "A4", "pic.png"))
+
+        stats = pm.archive_project("clash", workspace_dir=ws)
+
+        assert stats['thumbnails_created'] == 2
+        thumb = Image.open(os.path.join(ws, "_past_printed", "pic.jpg")).convert("RGB")
+        r, g, b = thumb.getpixel((25, 25))
+        assert b > 200 and r < 50
+
+    def test_thumbnail_names_differing_in_case_are_made_in_order(self, tmp_path, monkeypatch):
+        import src.services.project_manager as project_manager
+        from PIL import Image
+        ws = workspace(tmp_path)
+        pm = ProjectManager(workspace_directory=ws)
+        proj = pm.create_project("case", ws)
+        os.makedirs(os.path.join(proj.output_folder, "A4"))
+        Image.new("RGB", (20, 20)).save(os.path.join(proj.output_folder, "IMG_1.png"))
+        Image.new("RGB", (20, 20)).save(os.path.join(proj.output_folder, "A4", "img_1.JPG"))
+        Image.new("RGB", (20, 20)).save(os.path.join(proj.output_folder, "other.jpg"))
+        groups = []
+        real = project_manager._make_thumbnails
+        monkeypatch.setattr(project_manager, "_make_thumbnails",
+                            lambda jobs, size: groups.append(
+                                [os.path.basename(t) for _, t in jobs]) or real(jobs, size))
+
+        pm.archive_project("case", workspace_dir=ws)
+
+        # one sequential group, each source still saved under its own name
+        assert sorted(groups) == [["IMG_1.jpg", "img_1.jpg"], ["other.jpg"]]